@@ -0,0 +1,419 @@
+"""채팅 백엔드 벤치마크
+
+합성 DB(채팅방 N개, 메시지 M개, 일부 응답에 이미지 경로)를 만들고
+ChatDatabase 메서드와 API 엔드포인트(프로세스 안 ASGI 클라이언트)의
+지연 시간 백분위수(p50/p90/p99)와 처리량을 측정한다.
+
+결과는 JSON으로 저장하고, 저장해 둔 기준(baseline) 결과와 비교해서 느려진 항목을 표시한다.
+같은 --seed와 데이터 설정이면 같은 DB와 같은 요청 순서가 만들어진다.
+
+사용 예:
+    python benchmark.py --rooms 1000 --messages 100000
+    python benchmark.py --rooms 1000 --messages 1000000 --output result.json --baseline baseline.json
+    python benchmark.py --save-baseline      # 이번 결과를 기준으로 저장
+
+생성한 DB는 --data-dir/<설정 이름>/sqlite.db 에 남겨 두고 다음 실행 때 재사용한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# main.py는 가져올 때 환경 변수를 읽으므로 먼저 설정 (콘솔 입력 대기/자동 보관/자동 백업 끔)
+os.environ.setdefault("CHAT_INTERACTIVE", "0")
+os.environ.setdefault("CHAT_ARCHIVE_INTERVAL", "0")
+os.environ.setdefault("CHAT_BACKUP_INTERVAL", "0")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import main
+
+try:
+    import httpx  # 선택 의존성: 없으면 엔드포인트 벤치마크는 건너뜀
+except ImportError:
+    httpx = None
+
+SEARCH_WORDS = ["안녕하세요", "이미지", "분석", "결과", "모듈", "오류", "확인", "요청", "데이터", "처리"]
+
+def percentile(sorted_values, fraction):
+    """정렬된 값에서 백분위수 (선형 보간)"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(latencies, elapsed):
+    """지연 시간 목록(초)을 ms 단위 통계로 요약"""
+    values = sorted(latencies)
+    to_ms = lambda value: round(value * 1000, 3)
+    return {
+        "count": len(values),
+        "mean_ms": to_ms(statistics.fmean(values)),
+        "min_ms": to_ms(values[0]),
+        "p50_ms": to_ms(percentile(values, 0.50)),
+        "p90_ms": to_ms(percentile(values, 0.90)),
+        "p99_ms": to_ms(percentile(values, 0.99)),
+        "max_ms": to_ms(values[-1]),
+        "throughput_per_sec": round(len(values) / elapsed, 1) if elapsed > 0 else None
+    }
+
+def room_weights(room_count, skew):
+    """채팅방별 선택 가중치 (Zipf 분포: 1/순위^skew, skew=0이면 균등)"""
+    return [1 / (rank ** skew) for rank in range(1, room_count + 1)]
+
+def data_profile_name(args):
+    return f"r{args.rooms}_m{args.messages}_i{args.image_ratio}_s{args.skew}_seed{args.seed}"
+
+def generate_database(args, data_dir):
+    """합성 데이터로 sqlite.db 생성 (이미 같은 설정으로 만들어져 있으면 재사용)
+    
+    메시지 하나마다 채팅과 응답을 차례로 저장하므로 seq/타임라인/전문 검색 색인이
+    실제 저장 경로(트리거)와 같은 모양으로 만들어진다.
+    이미지 파일은 만들지 않고 채팅방 폴더 아래 경로만 기록한다.
+    """
+    db_path = data_dir / "sqlite.db"
+    profile = data_profile_name(args)
+    
+    if db_path.exists():
+        connection = sqlite3.connect(str(db_path))
+        try:
+            row = connection.execute(
+                "SELECT value FROM app_state WHERE key = 'benchmark_profile'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        finally:
+            connection.close()
+        
+        if row and row[0] == profile:
+            print(f"기존 벤치마크 DB를 재사용합니다: {db_path}")
+            return
+        print(f"설정이 다른 벤치마크 DB를 지웁니다: {db_path}")
+        for path in data_dir.glob("sqlite.db*"):
+            path.unlink()
+    
+    print(f"벤치마크 DB 생성: 채팅방 {args.rooms}개, 메시지 {args.messages}개 ({db_path})")
+    started = time.perf_counter()
+    
+    db = main.ChatDatabase(str(db_path), sharded=False)
+    db.initialize_database()
+    connection = db.connection
+    
+    rng = random.Random(args.seed)
+    connection.execute("PRAGMA synchronous = OFF")
+    connection.executemany(
+        "INSERT INTO chatroom (id) VALUES (?)",
+        [(room_id,) for room_id in range(1, args.rooms + 1)]
+    )
+    
+    weights = room_weights(args.rooms, args.skew)
+    room_ids = rng.choices(range(1, args.rooms + 1), weights=weights, k=args.messages)
+    
+    # 최근 args.days일 동안 고르게 퍼진 시각 (아카이브 기준일보다 최근)
+    start_time = datetime.now() - timedelta(days=args.days)
+    step = timedelta(days=args.days) / max(args.messages, 1)
+    image_numbers = {}
+    
+    cursor = connection.cursor()
+    for index, chatroom_id in enumerate(room_ids):
+        created_at = (start_time + step * index).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        words = " ".join(rng.choices(SEARCH_WORDS, k=rng.randint(3, 12)))
+        
+        cursor.execute(
+            "INSERT INTO chat (message, chatroom_id, created_at) VALUES (?, ?, ?)",
+            (f"질문 {index}: {words}", chatroom_id, created_at)
+        )
+        chat_id = cursor.lastrowid
+        
+        image_path = None
+        if rng.random() < args.image_ratio:
+            number = image_numbers.get(chatroom_id, 0) + 1
+            image_numbers[chatroom_id] = number
+            image_path = str(Path(f"./chatroom_{chatroom_id}/bench_{number}.jpeg").resolve())
+        
+        cursor.execute(
+            "INSERT INTO response (message, chat_id, image_path, created_at) VALUES (?, ?, ?, ?)",
+            (f"응답: {words}에 대한 답변입니다.", chat_id, image_path, created_at)
+        )
+        
+        if (index + 1) % 50000 == 0:
+            connection.commit()
+            print(f"  {index + 1}/{args.messages} 메시지 생성...")
+    
+    connection.execute("UPDATE chatroom SET version = last_seq")
+    connection.execute(
+        "INSERT INTO app_state (key, value) VALUES ('benchmark_profile', ?)", (profile,)
+    )
+    connection.commit()
+    connection.execute("ANALYZE")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    db.close()
+    
+    print(f"벤치마크 DB 생성 완료 ({time.perf_counter() - started:.1f}초)")
+
+def pick_rooms(args, count):
+    """측정에 쓸 채팅방 순서 (데이터와 같은 분포, 시드 고정)"""
+    rng = random.Random(args.seed + 1)
+    return rng.choices(range(1, args.rooms + 1), weights=room_weights(args.rooms, args.skew), k=count)
+
+def method_cases(args):
+    """(이름, 채팅방 -> 호출) 목록"""
+    rng = random.Random(args.seed + 2)
+    return [
+        ("get_chatrooms", lambda db, room: db.get_chatrooms()),
+        ("get_chatroom_history", lambda db, room: db.get_chatroom_history(room, limit=100)),
+        ("get_recent_messages", lambda db, room: db.get_recent_messages(room, 10)),
+        ("get_all_chatroom_data", lambda db, room: db.get_all_chatroom_data(room)),
+        ("get_chatroom_timeline", lambda db, room: db.get_chatroom_timeline(room)),
+        ("get_chatroom_timeline_page", lambda db, room: db.get_chatroom_timeline(room, limit=100)),
+        ("search_messages", lambda db, room: db.search_messages(rng.choice(SEARCH_WORDS), limit=20)),
+    ]
+
+def run_method_benchmarks(args):
+    """ChatDatabase 메서드 직접 호출 (한 스레드, 순차 실행)"""
+    db = main.ChatDatabase()
+    db.initialize_database()
+    
+    results = {}
+    try:
+        for name, call in method_cases(args):
+            if args.only and not any(token in f"method:{name}" for token in args.only):
+                continue
+            
+            rooms = pick_rooms(args, args.warmup + args.iterations)
+            for room in rooms[:args.warmup]:
+                call(db, room)
+            
+            latencies = []
+            started = time.perf_counter()
+            for room in rooms[args.warmup:]:
+                request_started = time.perf_counter()
+                call(db, room)
+                latencies.append(time.perf_counter() - request_started)
+                if args.max_seconds and time.perf_counter() - started > args.max_seconds:
+                    break
+            
+            results[f"method:{name}"] = summarize(latencies, time.perf_counter() - started)
+            print_result(f"method:{name}", results[f"method:{name}"])
+    finally:
+        db.close()
+    
+    return results
+
+def endpoint_cases(args):
+    """(이름, 메서드, 채팅방 -> (경로, 쿼리)) 목록"""
+    rng = random.Random(args.seed + 3)
+    cases = [
+        ("GET /chatrooms", "GET", lambda room: ("/chatrooms", None)),
+        ("GET /chatrooms/{id}/history", "GET", lambda room: (f"/chatrooms/{room}/history", None)),
+        ("GET /chatrooms/{id}/messages", "GET", lambda room: (f"/chatrooms/{room}/messages", None)),
+        ("GET /chatrooms/{id}/all-data", "GET", lambda room: (f"/chatrooms/{room}/all-data", None)),
+        ("GET /chatrooms/{id}/timeline", "GET", lambda room: (f"/chatrooms/{room}/timeline", None)),
+        ("GET /chatrooms/{id}/timeline?limit=100", "GET",
+         lambda room: (f"/chatrooms/{room}/timeline", {"limit": 100})),
+        ("GET /search", "GET", lambda room: ("/search", {"q": rng.choice(SEARCH_WORDS)})),
+    ]
+    if args.writes:
+        # 쓰기는 DB를 바꾸므로 마지막에 측정 (다음 실행에서는 DB를 다시 만들어야 같은 조건)
+        cases.append(("POST /chat", "POST",
+                      lambda room: ("/chat", {"message": "벤치마크 메시지", "chatroom_id": room})))
+    return cases
+
+async def run_endpoint_benchmarks(args):
+    """ASGI 앱을 프로세스 안에서 호출 (네트워크 없이 라우팅/직렬화/압축 포함)"""
+    results = {}
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            while (await client.get("/readyz")).status_code != 200:
+                if main.startup_state["phase"] == "failed":
+                    raise RuntimeError(f"서버 시작 실패: {main.startup_state['error']}")
+                await asyncio.sleep(0.05)
+            
+            for name, method, build in endpoint_cases(args):
+                if args.only and not any(token in f"endpoint:{name}" for token in args.only):
+                    continue
+                
+                rooms = pick_rooms(args, args.warmup + args.iterations)
+                for room in rooms[:args.warmup]:
+                    path, params = build(room)
+                    await client.request(method, path, params=params)
+                
+                queue = asyncio.Queue()
+                for room in rooms[args.warmup:]:
+                    queue.put_nowait(room)
+                latencies = []
+                errors = 0
+                started = time.perf_counter()
+                
+                async def worker():
+                    nonlocal errors
+                    while not queue.empty():
+                        if args.max_seconds and time.perf_counter() - started > args.max_seconds:
+                            return
+                        path, params = build(queue.get_nowait())
+                        request_started = time.perf_counter()
+                        response = await client.request(method, path, params=params)
+                        latencies.append(time.perf_counter() - request_started)
+                        if response.status_code >= 400 or b'"error"' in response.content[:200]:
+                            errors += 1
+                
+                await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+                
+                result = summarize(latencies, time.perf_counter() - started)
+                result["errors"] = errors
+                result["concurrency"] = args.concurrency
+                results[f"endpoint:{name}"] = result
+                print_result(f"endpoint:{name}", result)
+    
+    return results
+
+def print_result(name, result):
+    print(
+        f"  {name:<45} n={result['count']:<6} "
+        f"p50={result['p50_ms']:>9.3f}ms p90={result['p90_ms']:>9.3f}ms "
+        f"p99={result['p99_ms']:>9.3f}ms  {result['throughput_per_sec']}/s"
+    )
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_with_baseline(results, baseline, threshold):
+    """기준 결과와 p50/p99 비교. 느려진(비율 > 1 + threshold) 항목 이름 목록 반환"""
+    regressions = []
+    print(f"\n=== 기준 결과와 비교 (기준: {baseline['meta'].get('revision')} {baseline['meta'].get('timestamp')}) ===")
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if not base:
+            print(f"  {name:<45} (기준 없음)")
+            continue
+        
+        ratios = {
+            key: result[key] / base[key] if base[key] else None
+            for key in ("p50_ms", "p99_ms")
+        }
+        slower = any(ratio is not None and ratio > 1 + threshold for ratio in ratios.values())
+        faster = all(ratio is not None and ratio < 1 - threshold for ratio in ratios.values())
+        mark = "느려짐" if slower else "빨라짐" if faster else "비슷함"
+        if slower:
+            regressions.append(name)
+        
+        print(
+            f"  {name:<45} p50 {base['p50_ms']:.3f} -> {result['p50_ms']:.3f}ms "
+            f"(x{ratios['p50_ms'] or 0:.2f}), p99 {base['p99_ms']:.3f} -> {result['p99_ms']:.3f}ms "
+            f"(x{ratios['p99_ms'] or 0:.2f})  {mark}"
+        )
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="채팅 백엔드 벤치마크")
+    parser.add_argument("--rooms", type=int, default=1000, help="채팅방 수")
+    parser.add_argument("--messages", type=int, default=100000, help="전체 메시지(채팅) 수, 응답도 같은 수만큼 생성")
+    parser.add_argument("--image-ratio", type=float, default=0.1, help="이미지 경로가 있는 응답 비율")
+    parser.add_argument("--skew", type=float, default=1.0, help="채팅방 쏠림 (Zipf 지수, 0이면 균등)")
+    parser.add_argument("--days", type=int, default=30, help="메시지 시각을 퍼뜨릴 기간(일)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default="./bench_data", help="합성 DB를 보관할 폴더")
+    parser.add_argument("--iterations", type=int, default=200, help="항목별 측정 횟수")
+    parser.add_argument("--warmup", type=int, default=10, help="항목별 측정 전 워밍업 횟수")
+    parser.add_argument("--max-seconds", type=float, default=30, help="항목별 최대 측정 시간(초), 0이면 제한 없음")
+    parser.add_argument("--concurrency", type=int, default=8, help="엔드포인트 동시 요청 수")
+    parser.add_argument("--only", action="append", help="이름에 이 문자열이 들어간 항목만 측정 (여러 번 지정 가능)")
+    parser.add_argument("--skip-methods", action="store_true", help="메서드 벤치마크 생략")
+    parser.add_argument("--skip-endpoints", action="store_true", help="엔드포인트 벤치마크 생략")
+    parser.add_argument("--writes", action="store_true", help="POST /chat 도 측정 (DB가 바뀜)")
+    parser.add_argument("--output", default="benchmark_result.json", help="결과 JSON 파일")
+    parser.add_argument("--baseline", default="benchmark_baseline.json", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준 파일로 저장")
+    parser.add_argument("--threshold", type=float, default=0.2, help="이 비율 이상 느려지면 회귀로 표시")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    return parser.parse_args()
+
+def main_benchmark():
+    args = parse_args()
+    
+    if main.DB_URL or main.SHARD_MODE:
+        # 합성 DB는 단일 sqlite.db로만 만든다
+        print("벤치마크는 단일 SQLite DB에서만 실행합니다. CHAT_DB_URL / CHAT_SHARD_MODE를 비우고 실행하세요.")
+        sys.exit(2)
+    
+    output_path = Path(args.output).resolve()
+    baseline_path = Path(args.baseline).resolve()
+    data_dir = (Path(args.data_dir) / data_profile_name(args)).resolve()
+    data_dir.mkdir(parents=True, exist_ok=True)
+    
+    # main.py는 ./sqlite.db, ./archive, ./chatroom_{id} 같은 상대 경로를 쓰므로 데이터 폴더에서 실행
+    os.chdir(data_dir)
+    generate_database(args, data_dir)
+    
+    results = {}
+    if not args.skip_methods:
+        print("\n=== ChatDatabase 메서드 ===")
+        results.update(run_method_benchmarks(args))
+    
+    if not args.skip_endpoints:
+        if httpx is None:
+            print("\nhttpx 패키지가 없어 엔드포인트 벤치마크를 건너뜁니다.")
+        else:
+            print(f"\n=== API 엔드포인트 (동시 요청 {args.concurrency}) ===")
+            results.update(asyncio.run(run_endpoint_benchmarks(args)))
+    
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "data": {
+                "rooms": args.rooms,
+                "messages": args.messages,
+                "image_ratio": args.image_ratio,
+                "skew": args.skew,
+                "days": args.days,
+                "seed": args.seed
+            },
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency
+        },
+        "results": results
+    }
+    
+    output_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n결과를 저장했습니다: {output_path}")
+    
+    regressions = []
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        if baseline["meta"].get("data") != report["meta"]["data"]:
+            print("경고: 기준 결과와 데이터 설정이 다릅니다. 비교 결과를 그대로 믿지 마세요.")
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n느려진 항목 {len(regressions)}개: {', '.join(regressions)}")
+    
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"기준 결과로 저장했습니다: {baseline_path}")
+    
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,81 @@
+"""과거 대화 대량 가져오기
+
+NDJSON 또는 CSV 파일의 채팅방/채팅/응답을 ChatDatabase.bulk_import로 한 트랜잭션에 여러 행씩 저장한다.
+POST /chat을 메시지마다 부르면 메시지마다 두 번 커밋하지만, 여기서는 --batch-size 행마다 한 번만 커밋한다.
+
+레코드 형식 (파일 안의 id는 원본 시스템 id, 새 DB에서는 새 id를 받음):
+    {"type": "chatroom", "id": "room-a"}
+    {"type": "chat", "id": 10, "chatroom_id": "room-a", "message": "안녕하세요", "created_at": "2024-01-01 09:00:00"}
+    {"type": "response", "chat_id": 10, "message": "반갑습니다", "image_path": null}
+CSV는 type,id,chatroom_id,chat_id,message,image_path,created_at 헤더를 쓴다.
+레코드는 채팅방마다 대화 순서대로 있어야 한다 (순번을 파일 순서대로 매김).
+
+사용 예:
+    python bulk_import.py history.ndjson
+    python bulk_import.py history.csv --format csv --defer-indexes --rebuild-search   # 서버를 멈춘 상태의 첫 적재
+    python bulk_import.py history.ndjson --db ./sqlite.db --summary import_summary.json
+
+서버가 실행 중이어도 가져올 수 있지만(배치마다 잠깐씩 쓰기 잠금을 잡음),
+--defer-indexes 는 끝날 때까지 서버 조회가 느려지므로 서버를 멈추고 사용한다.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# main.py는 가져올 때 환경 변수를 읽으므로 먼저 설정 (콘솔 입력 대기 끔)
+os.environ.setdefault("CHAT_INTERACTIVE", "0")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import main
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="과거 대화 대량 가져오기")
+    parser.add_argument("path", help="가져올 NDJSON/CSV 파일")
+    parser.add_argument("--format", choices=("ndjson", "csv"), help="파일 형식 (기본: 확장자로 판단)")
+    parser.add_argument("--db", default="./sqlite.db", help="대상 SQLite DB (없으면 새로 만듦)")
+    parser.add_argument("--batch-size", type=int, default=main.IMPORT_BATCH_SIZE, help="트랜잭션 하나에 넣을 레코드 수")
+    parser.add_argument("--defer-indexes", action="store_true", help="순번 인덱스를 끝에 한 번에 다시 만듦")
+    parser.add_argument("--rebuild-search", action="store_true", help="검색 인덱스를 배치마다 채우지 않고 끝에 다시 만듦")
+    parser.add_argument("--summary", help="결과(채팅방 id 대응표 포함)를 저장할 JSON 파일")
+    return parser.parse_args()
+
+def main_import():
+    args = parse_args()
+    
+    if main.DB_URL or main.SHARD_MODE:
+        print("대량 가져오기는 단일 SQLite 파일에서만 지원합니다 (CHAT_DB_URL/CHAT_SHARD_MODE 없이 실행하세요).")
+        sys.exit(1)
+    
+    file_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    
+    chat_db = main.ChatDatabase(args.db, sharded=False)
+    chat_db.initialize_database()  # 새 DB면 테이블 생성, 기존 DB면 마이그레이션
+    
+    def on_progress(summary):
+        rows = summary["chats"] + summary["responses"]
+        print(f"  배치 {summary['batches']}: 메시지 {rows}개, 건너뜀 {summary['skipped']}개")
+    
+    try:
+        summary = chat_db.bulk_import(
+            main.read_import_records(args.path, file_format),
+            batch_size=args.batch_size,
+            defer_indexes=args.defer_indexes,
+            rebuild_search=args.rebuild_search,
+            progress=on_progress
+        )
+    finally:
+        chat_db.close()
+    
+    for error in summary["errors"][:10]:
+        print(f"  건너뜀 - {error}")
+    print(f"{summary['rows_per_second']} rows/s")
+    
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as summary_file:
+            json.dump(summary, summary_file, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.summary}")
+
+if __name__ == "__main__":
+    main_import()
@@ -0,0 +1,318 @@
+"""전체 대화 데이터 내보내기 (분석용 NDJSON / Parquet)
+
+/chatrooms/{id}/all-data 를 채팅방마다 부르는 대신 DB 파일을 읽기 전용으로 열어
+모든 채팅방/채팅/응답(아카이브 파일 포함)을 파일로 흘려 쓴다.
+
+- 한 번에 --batch-size 행씩만 읽고 바로 쓰므로 메모리 사용량은 DB 크기와 상관없이 일정하다.
+- 채팅방 id 범위를 메시지 수가 비슷하도록 --workers 개로 나눠 프로세스마다 따로 읽고 쓴다.
+- 시작할 때 chat/response의 최대 id를 기준점으로 정하고 모든 워커가 그 id까지만 읽으므로,
+  서버가 실행 중이어도 같은 시점의 데이터가 나온다 (각 워커는 하나의 읽기 트랜잭션 안에서 읽음).
+- --incremental 이면 지난번 기준점(export_state.json) 다음 id부터만 내보낸다.
+  id는 계속 증가하므로 새로 저장된 행만 나오고, 이미 내보낸 행의 수정(이미지 경로 변경)은 다시 나오지 않는다.
+
+출력 구조 (실행할 때마다 파일이 추가되므로 디렉터리째 데이터셋으로 읽으면 된다):
+    <output>/chatroom/<실행 id>.ndjson
+    <output>/chat/<실행 id>-<워커 번호>.ndjson
+    <output>/response/<실행 id>-<워커 번호>.ndjson
+    <output>/export_state.json
+
+사용 예:
+    python export.py --output ./export
+    python export.py --output ./export --format parquet --workers 8
+    python export.py --output ./export --incremental        # 매일 새 데이터만 추가
+
+Parquet은 pyarrow 패키지가 필요하다.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# main.py는 가져올 때 환경 변수를 읽으므로 먼저 설정 (콘솔 입력 대기 끔)
+os.environ.setdefault("CHAT_INTERACTIVE", "0")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import main
+
+try:
+    import pyarrow  # 선택 의존성: --format parquet 에 필요
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+STATE_FILE = "export_state.json"
+
+# 테이블별 내보낼 컬럼 (Parquet 스키마와 NDJSON 키 순서)
+COLUMNS = {
+    "chatroom": (("id", "int64"), ("version", "int64"), ("last_seq", "int64")),
+    "chat": (
+        ("id", "int64"), ("chatroom_id", "int64"), ("seq", "int64"),
+        ("message", "string"), ("created_at", "string")
+    ),
+    "response": (
+        ("id", "int64"), ("chat_id", "int64"), ("chatroom_id", "int64"), ("seq", "int64"),
+        ("message", "string"), ("image_path", "string"), ("created_at", "string")
+    )
+}
+
+def open_snapshot(db_path):
+    """읽기 전용 연결 (쓰기 잠금을 잡지 않고 WAL 스냅샷을 읽음)"""
+    connection = sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True, isolation_level=None)
+    connection.execute("PRAGMA query_only = ON")
+    return connection
+
+class ExportWriter:
+    """한 테이블의 출력 파일 하나 (배치 단위로 추가, 끝나면 임시 이름에서 바꿈)"""
+    
+    def __init__(self, path, table, file_format):
+        self.path = Path(path)
+        self.temp_path = self.path.with_name(self.path.name + ".tmp")
+        self.table = table
+        self.file_format = file_format
+        self.rows = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        if file_format == "parquet":
+            self.schema = pyarrow.schema([
+                (name, getattr(pyarrow, column_type)()) for name, column_type in COLUMNS[table]
+            ])
+            self.writer = pyarrow.parquet.ParquetWriter(str(self.temp_path), self.schema, compression="zstd")
+        else:
+            self.writer = open(self.temp_path, "w", encoding="utf-8")
+    
+    def write(self, rows):
+        """행(튜플, COLUMNS 순서) 목록 쓰기"""
+        if not rows:
+            return
+        
+        names = [name for name, _ in COLUMNS[self.table]]
+        if self.file_format == "parquet":
+            # 배치 하나가 row group 하나
+            columns = list(zip(*rows))
+            self.writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+                schema=self.schema
+            ))
+        else:
+            self.writer.write("".join(
+                json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n" for row in rows
+            ))
+        self.rows += len(rows)
+    
+    def close(self, keep=True):
+        """keep=False면 (중간에 실패한 경우) 쓰던 파일을 버림, 빈 파일도 남기지 않음"""
+        self.writer.close()
+        if keep and self.rows:
+            os.replace(self.temp_path, self.path)
+        else:
+            self.temp_path.unlink()
+
+def archive_paths(connection, db_path):
+    """이 DB의 월별 아카이브 파일 경로"""
+    chat_db = main.ChatDatabase(db_path, sharded=False)
+    months = [row[0] for row in connection.execute("SELECT DISTINCT month FROM archive_index ORDER BY month")]
+    return [path for path in map(chat_db.get_archive_path, months) if os.path.exists(path)]
+
+def split_room_ranges(connection, workers, since, until):
+    """새 채팅 수가 비슷하도록 채팅방 id를 workers 개의 연속 구간으로 나눔
+    
+    [(첫 채팅방 id, 마지막 채팅방 id)], None은 끝이 열린 구간.
+    구간 사이에 빈틈이 없으므로 새 채팅 없이 새 응답만 있는 채팅방도 어느 한 워커가 읽는다.
+    """
+    counts = connection.execute("""
+        SELECT chatroom_id, COUNT(*) FROM chat
+        WHERE chatroom_id IS NOT NULL AND id > ? AND id <= ?
+        GROUP BY chatroom_id ORDER BY chatroom_id
+    """, (since["chat_id"], until["chat_id"])).fetchall()
+    
+    total = sum(count for _, count in counts)
+    boundaries, accumulated = [], 0
+    for chatroom_id, count in counts[:-1]:
+        accumulated += count
+        if accumulated >= total / workers * (len(boundaries) + 1) and len(boundaries) < workers - 1:
+            boundaries.append(chatroom_id)
+    
+    starts = [None] + [boundary + 1 for boundary in boundaries]
+    return list(zip(starts, boundaries + [None]))
+
+def room_condition(column, room_range):
+    """채팅방 구간 조건 SQL (:first_room, :last_room 자리표시자)"""
+    first_room, last_room = room_range
+    conditions = []
+    if first_room is not None:
+        conditions.append(f"{column} >= :first_room")
+    if last_room is not None:
+        conditions.append(f"{column} <= :last_room")
+    return " AND ".join(conditions) or "1"
+
+def export_range(db_path, output_dir, run_id, worker, room_range, since, until, file_format, batch_size):
+    """워커 하나: 채팅방 구간의 chat/response를 메인 DB와 아카이브에서 읽어 파일로 쓰기"""
+    params = {
+        "first_room": room_range[0],
+        "last_room": room_range[1],
+        **{f"since_{key}": value for key, value in since.items()},
+        **{f"until_{key}": value for key, value in until.items()}
+    }
+    
+    # 증분 내보내기는 새 id가 적으므로 id(rowid) 범위로 찾고 (+로 채팅방 인덱스 사용을 막음),
+    # 전체 내보내기는 채팅방 순번 인덱스를 따라 채팅방/순서대로 읽는다
+    incremental = since["chat_id"] > 0 or since["response_id"] > 0
+    room_column = "+chatroom_id" if incremental else "chatroom_id"
+    
+    connection = open_snapshot(db_path)
+    writers = {
+        table: ExportWriter(
+            Path(output_dir) / table / f"{run_id}-{worker:03d}.{file_format}", table, file_format
+        )
+        for table in ("chat", "response")
+    }
+    completed = False
+    try:
+        # ATTACH는 트랜잭션 밖에서만 가능
+        sources = ["main"]
+        for index, path in enumerate(archive_paths(connection, db_path)):
+            connection.execute(f"ATTACH DATABASE ? AS archive_{index}",
+                               (f"file:{Path(path).resolve()}?mode=ro",))
+            sources.append(f"archive_{index}")
+        
+        connection.execute("BEGIN")  # 이 워커가 읽는 동안 같은 스냅샷 유지
+        # 읽기 트랜잭션은 파일마다 처음 읽을 때 시작되므로 모든 파일을 바로 읽어서 스냅샷을 같은 시점에 고정
+        # (아니면 메인 DB를 읽는 사이 아카이브로 옮겨진 행을 아카이브에서 한 번 더 읽을 수 있음)
+        for schema in sources:
+            connection.execute(f"SELECT 1 FROM {schema}.chat LIMIT 1").fetchall()
+        
+        for schema in sources:
+            cursor = connection.execute(f"""
+                SELECT id, chatroom_id, seq, message, created_at
+                FROM {schema}.chat
+                WHERE id > :since_chat_id AND id <= :until_chat_id
+                  AND {room_condition(room_column, room_range)}
+                {"" if incremental else "ORDER BY chatroom_id, seq"}
+            """, params)
+            while rows := cursor.fetchmany(batch_size):
+                writers["chat"].write(rows)
+            
+            # 응답의 채팅방은 같은 파일의 chat에서 찾음 (아카이브는 채팅과 응답을 함께 옮김)
+            cursor = connection.execute(f"""
+                SELECT r.id, r.chat_id, c.chatroom_id, r.seq, r.message, r.image_path, r.created_at
+                FROM {schema}.response r
+                JOIN {schema}.chat c ON c.id = r.chat_id
+                WHERE r.id > :since_response_id AND r.id <= :until_response_id
+                  AND {room_condition("+c.chatroom_id" if incremental else "c.chatroom_id", room_range)}
+            """, params)
+            while rows := cursor.fetchmany(batch_size):
+                writers["response"].write(rows)
+        
+        connection.execute("COMMIT")
+        completed = True
+    finally:
+        for writer in writers.values():
+            writer.close(keep=completed)
+        connection.close()
+    
+    return {table: writer.rows for table, writer in writers.items()}
+
+def load_state(output_dir):
+    path = Path(output_dir) / STATE_FILE
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as state_file:
+        return json.load(state_file)
+
+def save_state(output_dir, state):
+    path = Path(output_dir) / STATE_FILE
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as state_file:
+        json.dump(state, state_file, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="전체 대화 데이터 내보내기")
+    parser.add_argument("--db", default="./sqlite.db", help="내보낼 SQLite DB")
+    parser.add_argument("--output", default="./export", help="출력 폴더")
+    parser.add_argument("--format", choices=("ndjson", "parquet"), default="ndjson")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="병렬 워커(프로세스) 수")
+    parser.add_argument("--batch-size", type=int, default=10000, help="한 번에 읽고 쓸 행 수 (Parquet row group 크기)")
+    parser.add_argument("--incremental", action="store_true", help="지난번 내보낸 id 다음부터만 내보냄")
+    return parser.parse_args()
+
+def main_export():
+    args = parse_args()
+    
+    if main.DB_URL or main.SHARD_MODE:
+        print("내보내기는 단일 SQLite 파일에서만 지원합니다 (CHAT_DB_URL/CHAT_SHARD_MODE 없이 실행하세요).")
+        sys.exit(1)
+    if args.format == "parquet" and pyarrow is None:
+        print("Parquet으로 내보내려면 pyarrow 패키지가 필요합니다.")
+        sys.exit(1)
+    if not os.path.exists(args.db):
+        print(f"DB 파일이 없습니다: {args.db}")
+        sys.exit(1)
+    
+    started = time.perf_counter()
+    # 같은 초에 시작한 다른 실행의 파일을 덮어쓰지 않도록 pid를 붙임
+    run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+    empty = {"chatroom_id": 0, "chat_id": 0, "response_id": 0}
+    previous = load_state(args.output) if args.incremental else None
+    since = {key: previous[key] for key in empty} if previous else empty
+    
+    connection = open_snapshot(args.db)
+    try:
+        # 이번 실행의 기준점 (모든 워커가 이 id까지만 읽음)
+        connection.execute("BEGIN")
+        until = dict(zip(empty, connection.execute("""
+            SELECT (SELECT COALESCE(MAX(id), 0) FROM chatroom),
+                   (SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'chat'),
+                   (SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'response')
+        """).fetchone()))
+        
+        ranges = split_room_ranges(connection, max(1, args.workers), since, until)
+        connection.execute("COMMIT")
+    finally:
+        connection.close()
+    
+    print(f"내보내기 시작: {args.db} -> {args.output} ({args.format}, 워커 {len(ranges)}개)")
+    print(f"  id 범위: chat {since['chat_id']}~{until['chat_id']}, response {since['response_id']}~{until['response_id']}")
+    
+    totals = {"chatroom": 0, "chat": 0, "response": 0}
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [
+            executor.submit(
+                export_range, args.db, args.output, run_id, worker, room_range,
+                since, until, args.format, args.batch_size
+            )
+            for worker, room_range in enumerate(ranges)
+        ]
+        for future in futures:
+            for table, rows in future.result().items():
+                totals[table] += rows
+    
+    # 채팅방 목록은 작으므로 워커가 모두 성공한 뒤 기준점까지 한 번에 씀
+    connection = open_snapshot(args.db)
+    chatrooms = ExportWriter(Path(args.output) / "chatroom" / f"{run_id}.{args.format}", "chatroom", args.format)
+    try:
+        cursor = connection.execute("""
+            SELECT id, version, last_seq FROM chatroom WHERE id > ? AND id <= ? ORDER BY id
+        """, (since["chatroom_id"], until["chatroom_id"]))
+        while rows := cursor.fetchmany(args.batch_size):
+            chatrooms.write(rows)
+    finally:
+        chatrooms.close()
+        connection.close()
+    totals["chatroom"] = chatrooms.rows
+    
+    # 모든 워커가 끝난 뒤에만 기준점을 저장 (중간에 실패하면 다음 실행이 같은 범위를 다시 내보냄)
+    save_state(args.output, {**until, "run_id": run_id, "format": args.format, "exported_at": datetime.now().isoformat()})
+    
+    elapsed = time.perf_counter() - started
+    rows = totals["chat"] + totals["response"]
+    print(f"내보내기 완료: 채팅방 {totals['chatroom']}개, 채팅 {totals['chat']}개, 응답 {totals['response']}개, "
+          f"{elapsed:.1f}초 ({rows / elapsed:.0f} rows/s)")
+
+if __name__ == "__main__":
+    main_export()
@@ -0,0 +1,371 @@
+"""배포 산출물 인코딩 복구 도구
+
+ibk_publish_guide.md 의 'iconv -f LATIN1 -t UTF-8' 단계를 대신한다.
+폴더 전체 또는 tar 스트림(도커 이미지에서 꺼낸 app 폴더, MySQL 데이터 tar 등)을 돌면서
+파일마다 상태를 판별하고, 고쳐야 하는 파일만 프로세스 풀에서 조각(chunk) 단위로 변환한다.
+
+판별 결과:
+    binary   - NUL 바이트가 있거나 이미지/압축 파일 확장자 (건드리지 않음)
+    ok       - 올바른 UTF-8이고 깨진 글자가 없음 (건드리지 않음)
+    suspect  - UTF-8 바이트 모양의 구간도 있지만 그렇지 않은 Latin-1 글자가 더 많거나,
+               올바른 UTF-8 글자와 UTF-8이 아닌 바이트가 섞여 있음
+               (잘못된 인코딩으로 한 번 변환된 파일, 일부만 다른 인코딩으로 붙인 파일 등, 자동으로 고치지 않고 보고만 함)
+    mojibake - UTF-8 바이트를 Latin-1(cp1252)로 읽어서 다시 UTF-8로 저장한 이중 인코딩
+               ('한국어' -> 'í•œêµ­ì–´'). 깨진 구간만 원래 바이트로 되돌려 UTF-8로 다시 읽는다.
+               (MySQL의 CONVERT(CAST(CONVERT(col USING latin1) AS BINARY) USING utf8mb4) 와 같은 변환)
+    legacy   - 올바른 UTF-8 멀티바이트 글자가 (우연히 UTF-8 모양이 된 바이트 정도 말고는) 없는 비 UTF-8 파일. --source-encoding(기본 latin-1, 한국어 레거시 파일이면 cp949)으로 읽어 UTF-8로 저장
+               (가이드의 iconv 와 같은 변환)
+
+가이드처럼 모든 텍스트 파일에 iconv -f LATIN1 을 돌리면 이미 올바른 UTF-8 파일이 한 번 더 깨지지만,
+이 도구는 판별 후 필요한 파일만 바꾸고 이미 고친 파일은 ok로 판별하므로 몇 번을 다시 돌려도 결과가 같다.
+
+사용 예:
+    python fix_encoding.py tree /tmp/frontend-fix/app --dry-run          # 바꿀 파일만 보고
+    python fix_encoding.py tree /tmp/backend-fix/app --report fix_report.jsonl
+    python fix_encoding.py tar ibk_mysql_data.tar --output ibk_mysql_data_fixed.tar
+    docker run --rm img tar -cf - /app | python fix_encoding.py tar - --output - | ...
+
+파일은 --chunk-size 씩 읽고 쓰므로 수 GB 파일도 메모리를 그만큼만 쓴다.
+폴더 모드는 같은 폴더에 임시 파일을 쓰고 끝나면 원본과 바꾸며(권한 유지), 실패하면 원본이 그대로 남는다.
+"""
+import argparse
+import codecs
+import json
+import os
+import re
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+BINARY_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".bmp", ".pdf", ".zip", ".gz", ".tgz", ".bz2",
+    ".xz", ".zst", ".7z", ".jar", ".war", ".class", ".so", ".o", ".a", ".pyc", ".woff", ".woff2",
+    ".ttf", ".otf", ".eot", ".mp3", ".mp4", ".webm", ".wasm", ".db", ".sqlite", ".ibd", ".frm", ".myd", ".myi"
+}
+
+# cp1252의 0x80~0x9F 글자 -> 원래 바이트 (나머지 U+0080~U+00FF는 코드 값이 곧 바이트)
+CP1252_BYTES = {}
+for byte in range(0x80, 0xA0):
+    try:
+        CP1252_BYTES[bytes([byte]).decode("cp1252")] = byte
+    except UnicodeDecodeError:
+        pass  # cp1252에 없는 바이트는 Latin-1처럼 U+0080~U+009F 제어 문자로 남아 있음
+
+def char_class(first, last, cp1252=False):
+    """바이트 범위를 Latin-1/cp1252로 읽었을 때 나오는 글자들의 정규식 문자 집합"""
+    chars = [chr(byte) for byte in range(first, last + 1)]
+    if cp1252:
+        chars += [char for char, byte in CP1252_BYTES.items() if first <= byte <= last]
+    return "[" + re.escape("".join(chars)) + "]"
+
+# UTF-8 글자 하나(선행 바이트 + 연속 바이트)를 Latin-1/cp1252로 읽은 글자열이 이어진 구간
+_CONT = char_class(0x80, 0xBF, cp1252=True)
+MOJIBAKE_RUN = re.compile(
+    f"(?:{char_class(0xC2, 0xDF)}{_CONT}|{char_class(0xE0, 0xEF)}{_CONT}{{2}}|{char_class(0xF0, 0xF4)}{_CONT}{{3}})+"
+)
+# 조각 끝에 걸려 있을 수 있는 UTF-8 글자의 앞부분 (다음 조각으로 넘김)
+MOJIBAKE_TAIL = re.compile(f"{char_class(0xC2, 0xF4)}{_CONT}{{0,2}}$")
+# 고친 뒤에도 남은 Latin-1/cp1252 글자 (많으면 이중 인코딩이 아니라 다른 인코딩 파일로 봄)
+LEFTOVER = re.compile(char_class(0x80, 0xFF, cp1252=True))
+
+# surrogateescape로 읽은 UTF-8이 아닌 바이트 / 올바른 UTF-8 멀티바이트 글자
+SURROGATE = re.compile("[\udc80-\udcff]")
+MULTIBYTE = re.compile("[^\x00-\x7f\udc80-\udcff]")
+# cp949 등 2바이트 인코딩 파일은 글자의 바이트가 우연히 UTF-8 모양이 되기도 한다
+# (한국어 cp949 텍스트에서 UTF-8이 아닌 바이트 100개당 약 15글자). 이 비율 이하면 우연으로 보고 legacy로 판별
+CHANCE_MULTIBYTE_RATIO = 0.5
+
+_TO_LATIN1 = str.maketrans({char: chr(byte) for char, byte in CP1252_BYTES.items()})
+
+def original_bytes(run):
+    """깨진 구간 글자 -> 원래 바이트"""
+    return run.translate(_TO_LATIN1).encode("latin-1")
+
+@lru_cache(maxsize=65536)
+def fix_run(run):
+    """깨진 구간 하나 -> 원래 글자 (UTF-8로 읽히지 않으면 None, 덤프에는 같은 낱말이 반복되므로 캐시)"""
+    try:
+        return original_bytes(run).decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+def fix_mojibake(text):
+    """이중 인코딩된 구간을 원래 글자로 되돌림 -> (고친 텍스트, 고친 구간 수)
+
+    'café' 처럼 원래 Latin-1 글자는 UTF-8 바이트 모양이 아니므로 그대로 둔다.
+    """
+    count = 0
+    
+    def replace(match):
+        nonlocal count
+        run = match.group()
+        fixed = fix_run(run)
+        if fixed is None:
+            return run
+        count += 1
+        return fixed
+    
+    return MOJIBAKE_RUN.sub(replace, text), count
+
+class MojibakeRepairer:
+    """조각 단위 이중 인코딩 복구 (조각 경계에 걸친 바이트/깨진 구간은 다음 조각으로 넘김)
+
+    errors="surrogateescape" 이면 UTF-8이 아닌 바이트에서 멈추지 않고 그대로 통과시킨다
+    (결과를 같은 방식으로 인코딩하면 원래 바이트가 나옴).
+    """
+
+    def __init__(self, errors="strict"):
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors)
+        self.carry = ""
+        self.count = 0
+        self.leftover = 0
+    
+    def feed(self, data, final=False):
+        """바이트 조각 -> 고친 텍스트 (깨진 구간이 조각 끝에 걸리면 다음 조각과 합쳐서 고침)"""
+        text = self.carry + self.decoder.decode(data, final)
+        self.carry = ""
+        if not final:
+            tail = MOJIBAKE_TAIL.search(text, max(0, len(text) - 4))
+            if tail is not None:
+                text, self.carry = text[:tail.start()], text[tail.start():]
+        if text.isascii():
+            return text
+        fixed, count = fix_mojibake(text)
+        self.count += count
+        self.leftover += len(LEFTOVER.findall(fixed))
+        return fixed
+
+def scan(source, chunk_size=CHUNK_SIZE):
+    """파일 상태 판별 -> ('binary' | 'ok' | 'mojibake' | 'suspect' | 'legacy', 깨진 구간 수)"""
+    # UTF-8이 아닌 바이트에서 멈추지 않고 끝까지 읽어야 올바른 UTF-8 글자가 섞여 있는지 알 수 있음
+    repairer = MojibakeRepairer(errors="surrogateescape")
+    invalid = multibyte = 0  # UTF-8이 아닌 바이트 수, 올바른 UTF-8 멀티바이트 글자 수
+    position = 0
+    while True:
+        data = source.read(chunk_size)
+        # 앞 8KB 안에 NUL이 있으면 바이너리 (조각이 8KB보다 작으면 여러 조각에 걸쳐 확인)
+        if position < 8192 and b"\0" in data[:8192 - position]:
+            return "binary", 0
+        position += len(data)
+        text = repairer.feed(data, final=not data)
+        if not text.isascii():
+            invalid += len(SURROGATE.findall(text))
+            multibyte += len(MULTIBYTE.findall(text))
+        if not data:
+            break
+    if invalid:
+        # 올바른 UTF-8 글자가 섞여 있으면 파일 전체를 다른 인코딩으로 읽을 때 그 글자가 깨지므로 보고만 함
+        if multibyte > invalid * CHANCE_MULTIBYTE_RATIO:
+            return "suspect", repairer.count
+        return "legacy", 0
+    if not repairer.count:
+        return "ok", 0
+    return ("mojibake" if repairer.leftover < repairer.count else "suspect"), repairer.count
+
+def repair(source, target, status, source_encoding="latin-1", chunk_size=CHUNK_SIZE):
+    """판별 결과에 맞게 source를 UTF-8로 변환해서 target에 씀 -> 고친 구간 수 (legacy는 0)"""
+    if status == "legacy":
+        decoder = codecs.getincrementaldecoder(source_encoding)(errors="replace")
+        feed = lambda data, final: decoder.decode(data, final)
+    else:
+        repairer = MojibakeRepairer()
+        feed = repairer.feed
+    
+    while True:
+        data = source.read(chunk_size)
+        target.write(feed(data, not data).encode("utf-8"))
+        if not data:
+            break
+    return 0 if status == "legacy" else repairer.count
+
+def process_file(path, source_encoding="latin-1", dry_run=False, chunk_size=CHUNK_SIZE):
+    """파일 하나 판별/복구 (프로세스 풀에서 실행) -> 보고 항목"""
+    entry = {"path": str(path), "status": None, "runs": 0, "bytes": None}
+    try:
+        entry["bytes"] = os.path.getsize(path)
+        if Path(path).suffix.lower() in BINARY_EXTENSIONS:
+            entry["status"] = "binary"
+            return entry
+        
+        with open(path, "rb") as source:
+            entry["status"], entry["runs"] = scan(source, chunk_size)
+        if entry["status"] not in ("mojibake", "legacy") or dry_run:
+            return entry
+        
+        # 같은 폴더에 임시 파일로 쓰고 끝나면 원본과 바꿈 (권한 유지)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".fixenc-")
+        try:
+            with open(path, "rb") as source, os.fdopen(handle, "wb") as target:
+                repair(source, target, entry["status"], source_encoding, chunk_size)
+            shutil.copymode(path, temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        entry["fixed_bytes"] = os.path.getsize(path)
+    except Exception as e:
+        entry["status"] = "error"
+        entry["error"] = str(e)
+    return entry
+
+def iter_files(root, extensions=None):
+    """폴더 안의 일반 파일 (심볼릭 링크 제외, extensions가 있으면 그 확장자만)"""
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            if os.path.islink(path) or not os.path.isfile(path):
+                continue
+            if extensions and Path(name).suffix.lower() not in extensions:
+                continue
+            yield path
+
+def process_tree(root, workers, extensions=None, source_encoding="latin-1", dry_run=False, report=print):
+    """폴더 전체를 프로세스 풀에서 판별/복구"""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        paths = list(iter_files(root, extensions))
+        # 큰 파일부터 시작해서 마지막에 큰 파일 하나만 남아 기다리는 일이 없게 함
+        paths.sort(key=lambda path: os.path.getsize(path), reverse=True)
+        futures = [executor.submit(process_file, path, source_encoding, dry_run) for path in paths]
+        for future in futures:
+            report(future.result())
+
+def process_spooled(spool_path, source_encoding, chunk_size=CHUNK_SIZE):
+    """tar 멤버 임시 파일 판별/복구 (프로세스 풀에서 실행) -> (상태, 고친 구간 수)"""
+    with open(spool_path, "rb") as source:
+        status, runs = scan(source, chunk_size)
+    if status in ("mojibake", "legacy"):
+        fixed_path = spool_path + ".fixed"
+        with open(spool_path, "rb") as source, open(fixed_path, "wb") as target:
+            repair(source, target, status, source_encoding, chunk_size)
+        os.replace(fixed_path, spool_path)
+    return status, runs
+
+def process_tar(source, target, workers, extensions=None, source_encoding="latin-1", report=print):
+    """tar 스트림을 읽어 텍스트 멤버를 고친 새 tar 스트림으로 씀 (멤버 순서/권한/시각 유지)
+
+    멤버 크기가 헤더에 먼저 들어가야 하므로 멤버를 임시 폴더에 받아 풀에서 고친 뒤 순서대로 쓴다.
+    동시에 처리 중인 멤버는 workers * 2 개까지라 디스크 사용량도 그만큼으로 제한된다.
+    """
+    with tempfile.TemporaryDirectory(prefix="fixenc-") as spool_dir, \
+            tarfile.open(fileobj=source, mode="r|*") as reader, \
+            tarfile.open(fileobj=target, mode="w|", format=tarfile.PAX_FORMAT) as writer, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        
+        def write_next():
+            member, spool_path, future = pending.popleft()
+            entry = {"path": member.name, "status": "binary", "runs": 0, "bytes": member.size}
+            if future is not None:
+                entry["status"], entry["runs"] = future.result()
+                member.size = os.path.getsize(spool_path)
+                if entry["status"] in ("mojibake", "legacy"):
+                    entry["fixed_bytes"] = member.size
+            with open(spool_path, "rb") as data:
+                writer.addfile(member, data)
+            os.unlink(spool_path)
+            report(entry)
+        
+        for index, member in enumerate(reader):
+            if not member.isfile():
+                writer.addfile(member)
+                continue
+            
+            spool_path = os.path.join(spool_dir, f"{index}")
+            with open(spool_path, "wb") as spool:
+                shutil.copyfileobj(reader.extractfile(member), spool, CHUNK_SIZE)
+            
+            candidate = Path(member.name).suffix.lower() not in BINARY_EXTENSIONS and (
+                not extensions or Path(member.name).suffix.lower() in extensions
+            )
+            future = executor.submit(process_spooled, spool_path, source_encoding) if candidate else None
+            pending.append((member, spool_path, future))
+            while len(pending) > workers * 2:
+                write_next()
+        
+        while pending:
+            write_next()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="배포 산출물 인코딩 복구")
+    parser.add_argument("mode", choices=("tree", "tar"), help="tree: 폴더 안 파일을 제자리에서 고침, tar: tar 스트림을 고친 tar로 씀")
+    parser.add_argument("path", help="폴더 또는 tar 파일 (tar 모드에서 - 는 표준 입력, gz/bz2/xz 자동 판별)")
+    parser.add_argument("--output", help="tar 모드의 출력 tar (- 는 표준 출력)")
+    parser.add_argument("--source-encoding", default="latin-1", help="UTF-8이 아닌 파일의 원래 인코딩 (예: cp949)")
+    parser.add_argument("--ext", action="append", help="이 확장자만 처리 (예: --ext .sql --ext .js)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="변환 프로세스 수")
+    parser.add_argument("--dry-run", action="store_true", help="tree 모드에서 판별만 하고 파일은 바꾸지 않음")
+    parser.add_argument("--report", help="파일별 결과를 JSON Lines로 저장할 파일")
+    parser.add_argument("--verbose", action="store_true", help="바뀌지 않은 파일도 출력")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    codecs.lookup(args.source_encoding)  # 잘못된 인코딩 이름이면 바로 오류
+    extensions = {ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in args.ext or []}
+    
+    # tar를 표준 출력으로 쓸 때는 진행 상황을 표준 오류로 출력
+    log = sys.stderr if args.mode == "tar" and args.output == "-" else sys.stdout
+    report_file = open(args.report, "w", encoding="utf-8") if args.report else None
+    totals = Counter()
+    started = time.perf_counter()
+    
+    def report(entry):
+        totals[entry["status"]] += 1
+        totals["bytes"] += entry["bytes"] or 0
+        if report_file:
+            report_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        if args.verbose or entry["status"] in ("mojibake", "legacy", "suspect", "error"):
+            if entry["status"] == "error":
+                detail = entry["error"]
+            elif entry["status"] == "suspect":
+                found = f"UTF-8 모양 {entry['runs']}곳" if entry["runs"] else "UTF-8 글자와 UTF-8이 아닌 바이트가 섞임"
+                detail = f"{found}, 확인 필요 (바꾸지 않음)"
+            elif entry["status"] in ("mojibake", "legacy"):
+                detail = f"{entry['runs']}곳" if entry["status"] == "mojibake" else f"{args.source_encoding} -> UTF-8"
+                detail += " (확인만)" if args.dry_run else ""
+            else:
+                detail = ""  # ok/binary는 바꾸지 않았으므로 설명 없음
+            print(f"[{entry['status']}] {entry['path']} {detail}".rstrip(), file=log)
+    
+    try:
+        if args.mode == "tree":
+            if not os.path.isdir(args.path):
+                print(f"폴더가 없습니다: {args.path}", file=sys.stderr)
+                sys.exit(1)
+            process_tree(args.path, args.workers, extensions, args.source_encoding, args.dry_run, report)
+        else:
+            if not args.output:
+                print("tar 모드에는 --output 이 필요합니다.", file=sys.stderr)
+                sys.exit(1)
+            source = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+            target = sys.stdout.buffer if args.output == "-" else open(args.output + ".tmp", "wb")
+            with source, target:
+                process_tar(source, target, args.workers, extensions, args.source_encoding, report)
+            if args.output != "-":
+                os.replace(args.output + ".tmp", args.output)
+    finally:
+        if report_file:
+            report_file.close()
+    
+    elapsed = time.perf_counter() - started
+    changed = totals["mojibake"] + totals["legacy"]
+    print(
+        f"완료: 파일 {sum(totals[key] for key in ('ok', 'mojibake', 'legacy', 'suspect', 'binary', 'error'))}개 "
+        f"({totals['bytes'] / 1024 / 1024:.1f}MB, {elapsed:.1f}초) - "
+        f"{'바꿀' if args.dry_run else '바꾼'} 파일 {changed}개 (이중 인코딩 {totals['mojibake']}, "
+        f"{args.source_encoding} {totals['legacy']}), 확인 필요 {totals['suspect']}, 바이너리 {totals['binary']}, 오류 {totals['error']}",
+        file=log
+    )
+    if totals["error"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""MySQL SQL 덤프 tar 스트리밍 인코딩 복구/적재
+
+ibk_publish_guide.md 4단계(tar를 /tmp/mysql-fix에 풀고 iconv로 파일 전체를 변환한 뒤 다시 tar로 묶음)를 대신한다.
+tar를 한 번만 읽으면서 .sql 멤버의 이중 인코딩('í•œêµ­ì–´' -> '한국어')을 fix_encoding.py와 같은 방식으로
+조각 단위로 고치고, 결과를 새 tar로 쓰거나 SQL 문을 바로 mysql 클라이언트로 흘려 넣는다.
+덤프 크기와 상관없이 메모리는 --chunk-size 정도만 쓴다.
+
+    tar 출력: 고친 멤버는 크기가 줄어들기만 하므로 원래 크기를 그대로 헤더에 쓰고 남는 자리를 줄바꿈으로 채운다
+              (SQL 끝의 빈 줄은 실행 결과에 영향 없음). 나머지 멤버는 그대로 복사한다.
+              임시 파일을 쓰지 않는 대신 줄어든 만큼이 그대로 빈 줄로 남는다 - 한국어가 대부분인 덤프는
+              한 글자가 6~7바이트에서 3바이트로 줄어서 멤버의 약 1/3이 줄바꿈일 수 있다 (5.28MB 중 1.74MB 등).
+              UTF-8이 아닌 바이트가 있는 멤버는 (변환하면 커지므로) 오류로 멈춘다.
+    tar 출력 + --spool: .sql 멤버만 하나씩 임시 파일에 받아 적재 출력과 같이 판별/변환한 뒤 실제 크기로 쓴다
+              (줄바꿈 채움 없음, legacy 멤버도 변환). 임시 파일은 멤버 하나 크기의 두 배까지 쓴다.
+    적재 출력: .sql 멤버를 하나씩 임시 파일에 받아 fix_encoding.py와 같이 판별한 뒤, 이중 인코딩은 고치고
+              UTF-8이 아닌 파일(legacy)은 --source-encoding 으로 읽어 UTF-8로 바꿔서
+              tar 순서대로 --load 명령의 표준 입력으로 보낸다 (- 이면 표준 출력).
+              UTF-8 글자와 UTF-8이 아닌 바이트가 섞인 멤버(suspect)는 보내지 않고 멈춘다 (앞선 멤버는 이미 적재됨).
+
+사용 예:
+    python fix_sql_dump.py ibk_mysql_data.tar --output /tmp/ibk_mysql_data_fixed.tar
+    python fix_sql_dump.py ibk_mysql_data.tar --output /tmp/ibk_mysql_data_fixed.tar --spool --source-encoding cp949
+    python fix_sql_dump.py ibk_mysql_data.tar --load "docker exec -i ibk_mysql mysql -uroot -proot mydb --default-character-set=utf8mb4"
+    gunzip -c dump.tar.gz | python fix_sql_dump.py - --load - | mysql -uroot -proot mydb
+"""
+import argparse
+import codecs
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from fix_encoding import CHUNK_SIZE, MojibakeRepairer, repair, scan
+
+SQL_EXTENSIONS = {".sql"}
+SURROGATE = re.compile("[\udc80-\udcff]")
+
+class RepairedMember:
+    """tar 멤버를 읽으면서 이중 인코딩을 고쳐 주는 파일 객체 (size를 주면 그 크기까지 줄바꿈으로 채움)"""
+
+    def __init__(self, raw, size=None, chunk_size=CHUNK_SIZE):
+        self.raw = raw
+        self.size = size
+        self.chunk_size = chunk_size
+        self.repairer = MojibakeRepairer(errors="surrogateescape")
+        self.buffer = bytearray()
+        self.done = False
+        self.written = 0
+    
+    def fill(self):
+        data = self.raw.read(self.chunk_size)
+        text = self.repairer.feed(data, final=not data)
+        if not text.isascii() and SURROGATE.search(text):
+            # 다른 인코딩에서 UTF-8로 바꾸면 원래 크기를 넘으므로 헤더 크기를 지킬 수 없음
+            raise ValueError(
+                "UTF-8이 아닌 바이트가 있음 (--spool 을 주면 --source-encoding 으로 변환)"
+            )
+        self.buffer += text.encode("utf-8", "surrogateescape")
+        if not data:
+            self.done = True
+            self.fixed_size = self.written + len(self.buffer)
+            if self.size is not None:
+                if self.fixed_size > self.size:  # 고치면 줄어들기만 하므로 생기면 안 됨
+                    raise ValueError(f"변환 결과가 원본보다 큼 ({self.fixed_size} > {self.size})")
+                self.buffer += b"\n" * (self.size - self.fixed_size)
+    
+    def finish(self):
+        """끝까지 읽었는지 확인 (tar가 원래 크기만큼 읽고 멈춰도 마지막 조각까지 변환해 둠)"""
+        while not self.done:
+            self.fill()
+        return self
+    
+    def read(self, size=-1):
+        while not self.done and (size < 0 or len(self.buffer) < size):
+            self.fill()
+        if size < 0:
+            size = len(self.buffer)
+        chunk = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        self.written += len(chunk)
+        return chunk
+
+def is_sql(member, extensions):
+    return member.isfile() and Path(member.name).suffix.lower() in extensions
+
+def fix_tar(source, target, extensions=SQL_EXTENSIONS, spool=False, source_encoding="latin-1", report=print):
+    """tar 스트림 -> .sql 멤버를 고친 tar 스트림 (멤버 순서/권한/시각 유지)
+
+    spool=False면 멤버 크기도 유지 (줄어든 만큼 줄바꿈으로 채움),
+    spool=True면 멤버를 임시 파일에서 변환해서 실제 크기로 씀.
+    """
+    with tarfile.open(fileobj=source, mode="r|*") as reader, \
+            tarfile.open(fileobj=target, mode="w|", format=tarfile.PAX_FORMAT) as writer:
+        for member in reader:
+            if not member.isfile():
+                writer.addfile(member)
+                continue
+            if not is_sql(member, extensions):
+                writer.addfile(member, reader.extractfile(member))
+                continue
+            
+            if spool:
+                fixed, entry = convert_member(member, reader.extractfile(member), source_encoding)
+                with fixed:
+                    member.size = entry["fixed_bytes"]
+                    writer.addfile(member, fixed)
+                report(entry)
+                continue
+            
+            try:
+                fixed = RepairedMember(reader.extractfile(member), member.size)
+                writer.addfile(member, fixed)
+            except ValueError as e:
+                raise ValueError(f"{member.name}: {e}") from None
+            fixed.finish()
+            report({
+                "path": member.name,
+                "status": "mojibake" if fixed.repairer.count else "ok",
+                "bytes": member.size,
+                "fixed_bytes": fixed.fixed_size,
+                "runs": fixed.repairer.count
+            })
+
+def convert_member(member, raw, source_encoding="latin-1"):
+    """멤버를 임시 파일에 받아 판별하고 UTF-8로 바꾼 결과 -> (결과 임시 파일, 보고 항목)
+
+    크기 제약이 없을 때(적재 모드, --spool) 쓰므로 legacy 멤버도 --source-encoding 으로 변환한다.
+    suspect는 어느 쪽으로 읽어도 일부가 깨지므로 ValueError.
+    """
+    original = tempfile.TemporaryFile()
+    try:
+        shutil.copyfileobj(raw, original, CHUNK_SIZE)
+        original.seek(0)
+        status, runs = scan(original)
+        if status == "suspect":
+            raise ValueError(
+                f"{member.name}: UTF-8 글자와 UTF-8이 아닌 바이트가 섞여 있어 자동으로 바꿀 수 없음 "
+                "(fix_encoding.py tree --dry-run 으로 확인)"
+            )
+        original.seek(0)
+        if status in ("mojibake", "legacy"):
+            fixed = tempfile.TemporaryFile()
+            repair(original, fixed, status, source_encoding)
+            original.close()
+        else:
+            fixed = original  # ok (또는 NUL이 있어 binary로 판별된 멤버): 그대로 보냄
+    except BaseException:
+        original.close()
+        raise
+    
+    fixed_size = fixed.seek(0, 2)
+    fixed.seek(0)
+    entry = {"path": member.name, "status": status, "bytes": member.size, "fixed_bytes": fixed_size, "runs": runs}
+    return fixed, entry
+
+def load_tar(source, target, extensions=SQL_EXTENSIONS, source_encoding="latin-1", report=print):
+    """tar 스트림 -> .sql 멤버를 고쳐서 target(적재 명령 표준 입력)에 순서대로 씀"""
+    target.write(b"SET NAMES utf8mb4;\n")
+    with tarfile.open(fileobj=source, mode="r|*") as reader:
+        for member in reader:
+            if not is_sql(member, extensions):
+                continue
+            
+            # 판별하려면 멤버를 끝까지 읽어야 하므로 멤버 하나씩만 임시 파일에 받음
+            fixed, entry = convert_member(member, reader.extractfile(member), source_encoding)
+            with fixed:
+                shutil.copyfileobj(fixed, target, CHUNK_SIZE)
+            target.write(b"\n")  # 마지막 문장 뒤에 줄바꿈이 없어도 다음 파일과 붙지 않게 함
+            report(entry)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="MySQL SQL 덤프 tar 스트리밍 인코딩 복구/적재")
+    parser.add_argument("path", help="덤프 tar 파일 (- 는 표준 입력, gz/bz2/xz 자동 판별)")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument(
+        "--output",
+        help="고친 tar를 쓸 파일 (- 는 표준 출력). 멤버 크기를 유지하므로 줄어든 만큼 줄바꿈이 남음 "
+             "(한국어 덤프는 약 1/3), 실제 크기로 쓰려면 --spool"
+    )
+    output.add_argument("--load", help="SQL을 표준 입력으로 받을 적재 명령 (- 는 표준 출력)")
+    parser.add_argument("--ext", action="append", help="고칠 멤버 확장자 (기본 .sql)")
+    parser.add_argument("--spool", action="store_true", help="tar 출력에서 .sql 멤버를 임시 파일에서 변환해 실제 크기로 씀 (줄바꿈 채움 없음)")
+    parser.add_argument("--source-encoding", default="latin-1", help="적재 모드/--spool 에서 UTF-8이 아닌 멤버의 원래 인코딩 (예: cp949)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.spool and not args.output:
+        print("--spool 은 --output(tar 출력)에만 쓸 수 있습니다.", file=sys.stderr)
+        sys.exit(1)
+    codecs.lookup(args.source_encoding)  # 잘못된 인코딩 이름이면 바로 오류
+    extensions = {ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in args.ext or []} or SQL_EXTENSIONS
+    to_stdout = "-" in (args.output, args.load)
+    log = sys.stderr if to_stdout else sys.stdout
+    totals = {"files": 0, "bytes": 0, "fixed_bytes": 0, "runs": 0, "legacy": 0}
+    started = time.perf_counter()
+    
+    def report(entry):
+        for key in ("bytes", "fixed_bytes", "runs"):
+            totals[key] += entry[key]
+        totals["files"] += 1
+        totals["legacy"] += entry["status"] == "legacy"
+        detail = f"{args.source_encoding} -> UTF-8" if entry["status"] == "legacy" else f"{entry['runs']}곳 고침"
+        print(f"  {entry['path']}: {detail} ({entry['bytes']} -> {entry['fixed_bytes']} bytes)", file=log)
+    
+    source = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    try:
+        with source:
+            if args.output:
+                target = sys.stdout.buffer if args.output == "-" else open(args.output + ".tmp", "wb")
+                try:
+                    with target:
+                        fix_tar(source, target, extensions, args.spool, args.source_encoding, report)
+                except BaseException:
+                    if args.output != "-":
+                        Path(args.output + ".tmp").unlink()
+                    raise
+                if args.output != "-":
+                    Path(args.output + ".tmp").replace(args.output)
+            elif args.load == "-":
+                load_tar(source, sys.stdout.buffer, extensions, args.source_encoding, report)
+            else:
+                loader = subprocess.Popen(shlex.split(args.load), stdin=subprocess.PIPE)
+                try:
+                    load_tar(source, loader.stdin, extensions, args.source_encoding, report)
+                except BrokenPipeError:
+                    pass  # 적재 명령이 먼저 끝난 경우 (종료 코드로 확인)
+                finally:
+                    try:
+                        loader.stdin.close()
+                    except BrokenPipeError:
+                        pass
+                    loader.wait()  # 중간에 멈춰도 이미 보낸 SQL의 적재가 끝날 때까지 기다림
+                if loader.returncode != 0:
+                    print(f"적재 명령 실패 (종료 코드 {loader.returncode})", file=sys.stderr)
+                    sys.exit(1)
+    except ValueError as e:
+        print(f"중단: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    elapsed = time.perf_counter() - started
+    print(
+        f"완료: SQL 파일 {totals['files']}개 ({totals['bytes'] / 1024 / 1024:.1f}MB, {elapsed:.1f}초, "
+        f"{totals['bytes'] / 1024 / 1024 / max(elapsed, 1e-9):.1f}MB/s) - 고친 곳 {totals['runs']}개, "
+        f"{args.source_encoding}에서 변환한 파일 {totals['legacy']}개",
+        file=log
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+"""채팅 백엔드 부하 테스트 도구
+
+두 가지 명령이 있다.
+
+mock-llm: vLLM(OpenAI 호환) /v1/completions 를 흉내 내는 로컬 서버
+    첫 토큰까지의 지연(TTFT)과 토큰당 지연을 흉내 내고 stream=true면 SSE로 토큰을 흘려보낸다.
+    채팅 서버를 CHAT_LLM_URL=http://localhost:8001 로 띄우면 /chat 이 이 서버를 호출한다.
+
+run: 열린 루프(open-loop) 부하 생성기
+    응답을 기다리지 않고 정해진 도착률(포아송 분포)로 요청을 보내므로
+    서버가 느려져도 요청 속도가 줄지 않는다 (실제 사용자 트래픽과 같은 조건).
+    읽기/쓰기 비율과 채팅방 쏠림(Zipf)을 정할 수 있고, --rates 로 도착률을 단계별로 올리면서
+    처리량/지연 시간 백분위수/오류율을 측정해 포화 지점(처리량이 도착률을 못 따라가거나
+    p99가 --slo-ms를 넘거나 오류율이 --max-error-rate를 넘는 첫 단계)을 찾는다.
+
+사용 예:
+    python loadtest.py mock-llm --port 8001 --ttft-ms 300 --token-ms 25 --tokens 64
+    CHAT_LLM_URL=http://localhost:8001 CHAT_INTERACTIVE=0 python main.py
+    python loadtest.py run --url http://localhost:8000 --rates 10,20,50,100 --duration 30 \\
+        --mix chat=0.2,image=0.05,history=0.4,messages=0.25,timeline=0.1 --server-dir .
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import httpx  # run 명령에 필요
+except ImportError:
+    httpx = None
+
+DEFAULT_MIX = "chat=0.2,image=0.05,history=0.4,messages=0.25,timeline=0.1"
+MOCK_WORDS = ["네", "분석", "결과", "입니다", "이미지", "에서", "확인", "했습니다", "모듈", "처리"]
+
+# === mock vLLM 서버 ===
+
+def create_mock_llm_app(args):
+    """/v1/completions 를 흉내 내는 FastAPI 앱"""
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+    
+    app = FastAPI(title="Mock vLLM")
+    state = {"active": 0, "total": 0}
+    rng = random.Random(args.seed)
+    
+    def jittered(milliseconds):
+        return max(milliseconds * (1 + rng.uniform(-args.jitter, args.jitter)), 0) / 1000
+    
+    def token_count(request):
+        requested = int(request.get("max_tokens") or args.tokens)
+        return max(1, min(requested, args.tokens))
+    
+    def queue_delay():
+        # 동시 요청이 --max-batch 를 넘으면 배치 대기만큼 늦게 시작 (GPU 포화 흉내)
+        waiting_batches = max(state["active"] - 1, 0) // max(args.max_batch, 1)
+        return waiting_batches * (args.ttft_ms + args.token_ms * args.tokens) / 1000
+    
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", **state}
+    
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": args.model, "object": "model"}]}
+    
+    @app.post("/v1/completions")
+    async def completions(request: dict):
+        completion_id = f"cmpl-{uuid.uuid4().hex[:12]}"
+        tokens = [rng.choice(MOCK_WORDS) for _ in range(token_count(request))]
+        state["active"] += 1
+        state["total"] += 1
+        
+        if request.get("stream"):
+            async def stream():
+                try:
+                    await asyncio.sleep(queue_delay() + jittered(args.ttft_ms))
+                    for index, token in enumerate(tokens):
+                        if index:
+                            await asyncio.sleep(jittered(args.token_ms))
+                        chunk = {
+                            "id": completion_id,
+                            "object": "text_completion",
+                            "model": request.get("model", args.model),
+                            "choices": [{"index": 0, "text": token + " ", "finish_reason": None}]
+                        }
+                        yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                    yield "data: [DONE]\n\n"
+                finally:
+                    state["active"] -= 1
+            
+            return StreamingResponse(stream(), media_type="text/event-stream")
+        
+        try:
+            await asyncio.sleep(
+                queue_delay() + jittered(args.ttft_ms)
+                + sum(jittered(args.token_ms) for _ in tokens[1:])
+            )
+        finally:
+            state["active"] -= 1
+        
+        return {
+            "id": completion_id,
+            "object": "text_completion",
+            "created": int(time.time()),
+            "model": request.get("model", args.model),
+            "choices": [{"index": 0, "text": " ".join(tokens), "finish_reason": "length"}],
+            "usage": {
+                "prompt_tokens": len(str(request.get("prompt", "")).split()),
+                "completion_tokens": len(tokens),
+                "total_tokens": len(str(request.get("prompt", "")).split()) + len(tokens)
+            }
+        }
+    
+    return app
+
+def run_mock_llm(args):
+    import uvicorn
+    
+    print(
+        f"mock vLLM 서버: http://{args.host}:{args.port}/v1/completions "
+        f"(TTFT {args.ttft_ms}ms, 토큰당 {args.token_ms}ms, 최대 {args.tokens}토큰, 배치 {args.max_batch})"
+    )
+    uvicorn.run(create_mock_llm_app(args), host=args.host, port=args.port, log_level="warning")
+
+# === 부하 생성기 ===
+
+def parse_mix(text):
+    """'chat=0.2,history=0.4' -> {'chat': 0.2, 'history': 0.4}"""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in REQUEST_BUILDERS:
+            raise ValueError(f"알 수 없는 요청 종류: {name} (가능: {', '.join(REQUEST_BUILDERS)})")
+        mix[name] = float(weight)
+    return mix
+
+def build_chat(context, room):
+    return "POST", "/chat", {"message": f"부하 테스트 메시지 {context.rng.randint(1, 10**6)}", "chatroom_id": room}
+
+def build_image(context, room):
+    # 서버는 작업 폴더의 원본 이미지를 채팅방 폴더로 옮기므로 요청마다 새 파일을 놓아 둔다
+    filename = f"loadtest_{uuid.uuid4().hex}.jpeg"
+    (context.server_dir / filename).write_bytes(b"\xff\xd8\xff\xe0loadtest\xff\xd9")
+    return "POST", "/chat-with-image", {
+        "message": "이미지 분석 요청",
+        "original_image_filename": filename,
+        "module_name": "loadtest",
+        "chatroom_id": room
+    }
+
+def build_history(context, room):
+    return "GET", f"/chatrooms/{room}/history", {"limit": 100}
+
+def build_messages(context, room):
+    return "GET", f"/chatrooms/{room}/messages", {"limit": 10}
+
+def build_timeline(context, room):
+    return "GET", f"/chatrooms/{room}/timeline", {"limit": 100}
+
+def build_all_data(context, room):
+    return "GET", f"/chatrooms/{room}/all-data", None
+
+def build_chatrooms(context, room):
+    return "GET", "/chatrooms", None
+
+REQUEST_BUILDERS = {
+    "chat": build_chat,
+    "image": build_image,
+    "history": build_history,
+    "messages": build_messages,
+    "timeline": build_timeline,
+    "all-data": build_all_data,
+    "chatrooms": build_chatrooms,
+}
+
+class LoadContext:
+    def __init__(self, args, rooms):
+        self.rng = random.Random(args.seed)
+        self.rooms = rooms
+        self.room_weights = [1 / (rank ** args.skew) for rank in range(1, len(rooms) + 1)]
+        self.server_dir = Path(args.server_dir).resolve() if args.server_dir else None
+    
+    def pick_room(self):
+        return self.rng.choices(self.rooms, weights=self.room_weights)[0]
+
+async def prepare_rooms(client, room_count):
+    """채팅방이 room_count개보다 적으면 만들어서 채팅방 id 목록 반환"""
+    response = await client.get("/chatrooms", headers={"Accept": "application/json"})
+    rooms = sorted(room["id"] for room in response.json().get("chatrooms", []))
+    while len(rooms) < room_count:
+        created = (await client.post("/chatrooms")).json()
+        if "chatroom_id" not in created:
+            raise RuntimeError(f"채팅방을 만들 수 없습니다: {created}")
+        rooms.append(created["chatroom_id"])
+    return rooms[:room_count]
+
+async def run_step(client, context, mix, rate, duration, max_inflight):
+    """도착률 rate(요청/초)로 duration초 동안 열린 루프 부하를 걸고 결과 요약
+    
+    지연 시간은 예정된 전송 시각부터 잰다 (동시 요청 상한에 걸려 늦게 나간 시간도 포함,
+    coordinated omission 방지). 상한을 넘어 보내지 못한 요청은 dropped로 센다.
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    records = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    dropped = 0
+    inflight = 0
+    tasks = []
+    
+    async def send(name, scheduled):
+        nonlocal inflight
+        method, path, params = REQUEST_BUILDERS[name](context, context.pick_room())
+        try:
+            response = await client.request(method, path, params=params)
+            failed = response.status_code >= 400 or b'"error"' in response.content[:200]
+        except httpx.HTTPError:
+            failed = True
+        finally:
+            inflight -= 1
+        records[name].append(time.perf_counter() - scheduled)
+        if failed:
+            errors[name] += 1
+    
+    started = time.perf_counter()
+    next_time = started
+    while True:
+        next_time += context.rng.expovariate(rate)
+        if next_time - started > duration:
+            break
+        delay = next_time - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        if inflight >= max_inflight:
+            dropped += 1
+            continue
+        inflight += 1
+        name = context.rng.choices(names, weights=weights)[0]
+        tasks.append(asyncio.create_task(send(name, next_time)))
+    
+    send_window = time.perf_counter() - started
+    if tasks:
+        await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    
+    completed = [latency for latencies in records.values() for latency in latencies]
+    total_errors = sum(errors.values())
+    step = {
+        "offered_rate": rate,
+        "sent": len(tasks),
+        "dropped": dropped,
+        "completed": len(completed),
+        "errors": total_errors,
+        "error_rate": round(total_errors / len(completed), 4) if completed else None,
+        "throughput_per_sec": round((len(completed) - total_errors) / elapsed, 2) if elapsed else None,
+        "send_window_sec": round(send_window, 2),
+        "elapsed_sec": round(elapsed, 2),
+        "latency": latency_summary(completed),
+        "by_type": {
+            name: {**latency_summary(latencies), "errors": errors[name]}
+            for name, latencies in records.items() if latencies
+        }
+    }
+    return step
+
+def latency_summary(latencies):
+    if not latencies:
+        return {"count": 0}
+    values = sorted(latencies)
+    
+    def at(fraction):
+        return round(values[min(int(len(values) * fraction), len(values) - 1)] * 1000, 2)
+    
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values) * 1000, 2),
+        "p50_ms": at(0.50),
+        "p90_ms": at(0.90),
+        "p99_ms": at(0.99),
+        "max_ms": round(values[-1] * 1000, 2)
+    }
+
+def is_saturated(step, args):
+    """포화 판단: 처리량이 도착률의 --min-throughput-ratio 미만 / p99 > --slo-ms / 오류율 초과 / 요청 버림"""
+    reasons = []
+    if step["throughput_per_sec"] is not None and step["throughput_per_sec"] < step["offered_rate"] * args.min_throughput_ratio:
+        reasons.append("throughput")
+    if step["latency"].get("p99_ms", 0) > args.slo_ms:
+        reasons.append("p99")
+    if (step["error_rate"] or 0) > args.max_error_rate:
+        reasons.append("errors")
+    if step["dropped"]:
+        reasons.append("dropped")
+    return reasons
+
+async def run_load(args):
+    mix = parse_mix(args.mix)
+    if "image" in mix and not args.server_dir:
+        print("--server-dir 가 없어 이미지 요청(image)을 제외합니다. (서버 작업 폴더에 원본 이미지를 놓아야 함)")
+        mix.pop("image")
+    if not mix:
+        raise ValueError("보낼 요청 종류가 없습니다.")
+    
+    rates = [float(rate) for rate in args.rates.split(",")]
+    limits = httpx.Limits(max_connections=args.max_inflight, max_keepalive_connections=args.max_inflight)
+    
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        ready = await client.get("/readyz")
+        if ready.status_code != 200:
+            raise RuntimeError(f"서버가 준비되지 않았습니다: {ready.status_code} {ready.text}")
+        
+        context = LoadContext(args, await prepare_rooms(client, args.rooms))
+        print(f"대상 {args.url}, 채팅방 {len(context.rooms)}개 (쏠림 {args.skew}), 요청 비율 {mix}")
+        print(f"{'도착률':>8} {'보냄':>6} {'버림':>5} {'처리량/s':>9} {'오류율':>7} {'p50ms':>9} {'p90ms':>9} {'p99ms':>9}")
+        
+        steps = []
+        saturation = None
+        for rate in rates:
+            step = await run_step(client, context, mix, rate, args.duration, args.max_inflight)
+            step["saturated"] = is_saturated(step, args)
+            steps.append(step)
+            
+            latency = step["latency"]
+            print(
+                f"{rate:>8.1f} {step['sent']:>6} {step['dropped']:>5} {step['throughput_per_sec']:>9} "
+                f"{step['error_rate'] or 0:>7.2%} {latency.get('p50_ms', 0):>9} {latency.get('p90_ms', 0):>9} "
+                f"{latency.get('p99_ms', 0):>9}  {', '.join(step['saturated'])}"
+            )
+            
+            if step["saturated"] and saturation is None:
+                saturation = {"offered_rate": rate, "reasons": step["saturated"]}
+                if args.stop_at_saturation:
+                    break
+            
+            if args.cooldown:
+                await asyncio.sleep(args.cooldown)
+    
+    if saturation:
+        print(f"\n포화 지점: 도착률 {saturation['offered_rate']}/s ({', '.join(saturation['reasons'])})")
+    else:
+        print("\n측정한 도착률 안에서는 포화되지 않았습니다.")
+    
+    best = max(steps, key=lambda step: step["throughput_per_sec"] or 0)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "url": args.url,
+            "mix": mix,
+            "rooms": len(context.rooms),
+            "skew": args.skew,
+            "duration": args.duration,
+            "max_inflight": args.max_inflight,
+            "slo_ms": args.slo_ms,
+            "seed": args.seed
+        },
+        "steps": steps,
+        "saturation": saturation,
+        "max_throughput_per_sec": best["throughput_per_sec"]
+    }
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"결과를 저장했습니다: {args.output}")
+    return report
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="채팅 백엔드 부하 테스트")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    mock = commands.add_parser("mock-llm", help="mock vLLM /v1/completions 서버 실행")
+    mock.add_argument("--host", default="127.0.0.1")
+    mock.add_argument("--port", type=int, default=8001)
+    mock.add_argument("--model", default="mock-model")
+    mock.add_argument("--ttft-ms", type=float, default=200, help="첫 토큰까지 지연(ms)")
+    mock.add_argument("--token-ms", type=float, default=20, help="토큰당 지연(ms)")
+    mock.add_argument("--tokens", type=int, default=64, help="최대 생성 토큰 수")
+    mock.add_argument("--jitter", type=float, default=0.2, help="지연 시간 흔들림 비율 (0.2 = ±20%%)")
+    mock.add_argument("--max-batch", type=int, default=32, help="동시에 생성하는 요청 수, 넘으면 대기")
+    mock.add_argument("--seed", type=int, default=42)
+    
+    run = commands.add_parser("run", help="열린 루프 부하 생성")
+    run.add_argument("--url", default="http://127.0.0.1:8000", help="채팅 서버 주소")
+    run.add_argument("--rates", default="10,20,50,100", help="단계별 도착률(요청/초), 쉼표로 구분")
+    run.add_argument("--duration", type=float, default=30, help="단계별 측정 시간(초)")
+    run.add_argument("--cooldown", type=float, default=2, help="단계 사이 대기(초)")
+    run.add_argument("--mix", default=DEFAULT_MIX,
+                     help=f"요청 종류=비율 (종류: {', '.join(REQUEST_BUILDERS)})")
+    run.add_argument("--rooms", type=int, default=50, help="사용할 채팅방 수 (모자라면 생성)")
+    run.add_argument("--skew", type=float, default=1.0, help="채팅방 쏠림 (Zipf 지수, 0이면 균등)")
+    run.add_argument("--server-dir", help="서버 작업 폴더 (image 요청의 원본 이미지를 놓을 곳)")
+    run.add_argument("--max-inflight", type=int, default=512, help="동시에 처리 중인 요청 상한 (넘으면 버림)")
+    run.add_argument("--timeout", type=float, default=60, help="요청 타임아웃(초)")
+    run.add_argument("--slo-ms", type=float, default=1000, help="p99 목표(ms), 넘으면 포화로 판단")
+    run.add_argument("--max-error-rate", type=float, default=0.01)
+    run.add_argument("--min-throughput-ratio", type=float, default=0.9,
+                     help="처리량이 도착률의 이 비율보다 낮으면 포화로 판단")
+    run.add_argument("--stop-at-saturation", action="store_true", help="포화되면 다음 단계를 건너뜀")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--output", default="loadtest_result.json", help="결과 JSON 파일")
+    
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "mock-llm":
+        run_mock_llm(args)
+    else:
+        if httpx is None:
+            print("부하 생성에는 httpx 패키지가 필요합니다.")
+            sys.exit(2)
+        asyncio.run(run_load(args))
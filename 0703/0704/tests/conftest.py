@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# main.py와 standin.py를 패키지 설치 없이 import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
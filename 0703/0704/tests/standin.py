@@ -0,0 +1,104 @@
+"""서버 DB 저장소(ServerStorage) 테스트용 SQLite 대역
+
+MySQL/PostgreSQL 컨테이너 없이 ServerStorage의 공통 SQL(? 자리표시자, 트랜잭션 안의 timeline_event 추가,
+백필, 마이그레이션)을 실행해 보기 위한 드라이버. 풀 대신 SQLite 연결 하나를 쓰고, 테이블 정의는 MySQL/PostgreSQL과
+같은 열(밀리초 시각 포함)로 맞춘다.
+
+    storage = SQLiteServerStorage("standin:///tmp/chat.db")  # 경로가 없으면 메모리 DB
+    await storage.open()
+"""
+import sqlite3
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+import main
+
+class SQLiteServerSession:
+    """sqlite3 연결 래퍼 (MySQLSession/PostgresSession과 같은 fetch/insert/execute)"""
+    
+    def __init__(self, connection):
+        self.connection = connection
+    
+    async def fetch(self, query, params=()):
+        cursor = self.connection.execute(query, params)
+        columns = [column[0] for column in cursor.description]
+        return [main.normalize_record(dict(zip(columns, row))) for row in cursor.fetchall()]
+    
+    async def insert(self, query, params=()):
+        return self.connection.execute(query, params).lastrowid
+    
+    async def execute(self, query, params=()):
+        self.connection.execute(query, params)
+
+class SQLiteServerStorage(main.ServerStorage):
+    """SQLite로 흉내 낸 서버 DB 저장소 (연결 하나를 풀처럼 사용)"""
+    
+    name = "standin"
+    create_table_queries = (
+        """CREATE TABLE IF NOT EXISTS chatroom (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            version INTEGER NOT NULL DEFAULT 0
+        )""",
+        """CREATE TABLE IF NOT EXISTS chat (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            message TEXT NOT NULL,
+            chatroom_id INTEGER REFERENCES chatroom(id),
+            created_at DATETIME DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        )""",
+        """CREATE TABLE IF NOT EXISTS response (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            message TEXT NOT NULL,
+            chat_id INTEGER REFERENCES chat(id),
+            image_path TEXT,
+            created_at DATETIME DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        )""",
+        """CREATE TABLE IF NOT EXISTS timeline_event (
+            chatroom_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            ref_id INTEGER NOT NULL,
+            PRIMARY KEY (chatroom_id, seq)
+        )""",
+        """CREATE TABLE IF NOT EXISTS app_state (
+            name TEXT PRIMARY KEY,
+            value TEXT
+        )"""
+    )
+    insert_chatroom_query = "INSERT INTO chatroom DEFAULT VALUES"
+    upsert_state_query = main.PostgresStorage.upsert_state_query
+    insert_timeline_event_query = main.MySQLStorage.insert_timeline_event_query
+    columns_query = "SELECT name, type FROM pragma_table_info(?)"
+    sequence_column_queries = {
+        "chat": (
+            "ALTER TABLE chat ADD COLUMN seq BIGINT",
+            "CREATE INDEX IF NOT EXISTS idx_chat_room_seq ON chat (chatroom_id, seq)"
+        ),
+        "response": (
+            "ALTER TABLE response ADD COLUMN seq BIGINT",
+            "CREATE INDEX IF NOT EXISTS idx_response_chat_seq ON response (chat_id, seq)"
+        )
+    }
+    backfill_sequence_queries = main.PostgresStorage.backfill_sequence_queries  # UPDATE ... FROM
+    
+    async def create_pool(self):
+        path = urlparse(self.url).path or ":memory:"
+        return sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    
+    @asynccontextmanager
+    async def session(self, transaction=False):
+        if not transaction:
+            yield SQLiteServerSession(self.pool)
+            return
+        
+        self.pool.execute("BEGIN IMMEDIATE")
+        try:
+            yield SQLiteServerSession(self.pool)
+        except BaseException:
+            self.pool.execute("ROLLBACK")
+            raise
+        self.pool.execute("COMMIT")
+    
+    async def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
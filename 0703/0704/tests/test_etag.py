@@ -0,0 +1,54 @@
+"""조건부 GET - 채팅방 버전 ETag와 If-None-Match 304 (JSON/msgpack/컬럼형 응답별)"""
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+VARIANTS = {
+    "json": "application/json",
+    "msgpack": main.MSGPACK_MEDIA_TYPES[0],
+    "columnar": main.COLUMNAR_JSON_MEDIA_TYPE
+}
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # 앱이 ./sqlite.db를 임시 폴더에 만듦
+    monkeypatch.setattr(main, "INTERACTIVE_MODE", "0")
+    with TestClient(main.app) as client:
+        yield client
+    # 종료 시 닫힌 DB가 다음 테스트에 남지 않게
+    main.chat_db = None
+    main.storage = None
+
+@pytest.mark.parametrize("path", ["timeline", "history"])
+def test_write_changes_etag_for_every_variant(client, path):
+    chatroom_id = main.chat_db.create_chatroom()
+    main.chat_db.save_message("hello", chatroom_id)
+    url = f"/chatrooms/{chatroom_id}/{path}"
+    
+    etags = {}
+    for variant, accept in VARIANTS.items():
+        response = client.get(url, headers={"Accept": accept})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(accept)
+        assert response.headers["cache-control"] == "no-cache"
+        etags[variant] = response.headers["etag"]
+        
+        cached = client.get(url, headers={"Accept": accept, "If-None-Match": etags[variant]})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etags[variant]
+        assert cached.content == b""
+    
+    # 형식마다 본문이 다르므로 다른 형식의 ETag로는 304가 나오면 안 됨
+    assert len(set(etags.values())) == len(VARIANTS)
+    response = client.get(url, headers={"Accept": VARIANTS["msgpack"], "If-None-Match": etags["json"]})
+    assert response.status_code == 200
+    
+    main.chat_db.save_message("hello again", chatroom_id)
+    for variant, accept in VARIANTS.items():
+        response = client.get(url, headers={"Accept": accept, "If-None-Match": etags[variant]})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etags[variant]
+        
+        cached = client.get(url, headers={"Accept": accept, "If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
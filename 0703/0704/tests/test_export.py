@@ -0,0 +1,66 @@
+"""export.py - 아카이브가 있는 DB의 전체 내보내기 + 증분 내보내기에서 행이 빠지거나 겹치지 않는지"""
+import json
+import os
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+import main
+
+EXPORT_SCRIPT = Path(__file__).resolve().parent.parent / "export.py"
+
+def write_conversations(db, chatroom_ids, prefix, ids):
+    for chatroom_id in chatroom_ids:
+        for index in range(3):
+            chat_id = db.save_message(f"{prefix} {index}", chatroom_id)
+            ids["chat"].append(chat_id)
+            ids["response"].append(db.save_response(f"{prefix} response {index}", chat_id, chatroom_id=chatroom_id))
+
+def archive_everything(db):
+    db.connection.execute("UPDATE chat SET created_at = '2025-01-01 00:00:00'")
+    db.connection.execute("UPDATE response SET created_at = '2025-01-01 00:00:00'")
+    db.connection.commit()
+    db.archive_old_messages(30)
+
+def run_export(tmp_path, *args):
+    env = {key: value for key, value in os.environ.items() if key not in ("CHAT_DB_URL", "CHAT_SHARD_MODE")}
+    subprocess.run(
+        [sys.executable, str(EXPORT_SCRIPT), "--db", "sqlite.db", "--output", "export", "--workers", "2", *args],
+        cwd=tmp_path, env=env, check=True, capture_output=True
+    )
+
+def exported_ids(tmp_path, table):
+    """출력 폴더의 모든 실행 파일에 나온 id별 횟수"""
+    ids = Counter()
+    for path in (tmp_path / "export" / table).glob("*.ndjson"):
+        with open(path, encoding="utf-8") as export_file:
+            ids.update(json.loads(line)["id"] for line in export_file)
+    return ids
+
+def test_full_then_incremental_exports_every_row_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # 아카이브 폴더를 임시 폴더에 만듦
+    db = main.ChatDatabase(str(tmp_path / "sqlite.db"), sharded=False)
+    db.initialize_database()
+    chatroom_ids = [db.create_chatroom() for _ in range(4)]
+    ids = {"chat": [], "response": []}
+    
+    write_conversations(db, chatroom_ids, "old", ids)
+    archive_everything(db)
+    write_conversations(db, chatroom_ids[:2], "live", ids)
+    assert db.get_archived_months(chatroom_ids[0])
+    
+    run_export(tmp_path)
+    for table in ("chat", "response"):
+        assert sorted(exported_ids(tmp_path, table).elements()) == sorted(ids[table])
+    
+    # 다음 내보내기 전에 새 채팅방/메시지가 생기고, 이미 내보낸 행은 아카이브로 옮겨짐
+    chatroom_ids.append(db.create_chatroom())
+    archive_everything(db)
+    write_conversations(db, chatroom_ids[1:], "new", ids)
+    db.close()
+    
+    run_export(tmp_path, "--incremental")
+    for table in ("chat", "response"):
+        assert sorted(exported_ids(tmp_path, table).elements()) == sorted(ids[table])
+    assert sorted(exported_ids(tmp_path, "chatroom").elements()) == sorted(chatroom_ids)
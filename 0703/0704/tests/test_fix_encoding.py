@@ -0,0 +1,104 @@
+"""fix_encoding.py - 파일 상태 판별과 복구 (조각 경계에 걸친 글자 포함)"""
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import fix_encoding
+
+def double_encode(text):
+    """UTF-8 바이트를 cp1252(MySQL latin1)로 읽어서 다시 UTF-8로 저장한 바이트
+    
+    cp1252에 없는 바이트(0x81, 0x8D 등)는 MySQL처럼 같은 코드의 제어 문자가 된다.
+    """
+    to_char = {byte: char for char, byte in fix_encoding.CP1252_BYTES.items()}
+    return "".join(to_char.get(byte, chr(byte)) for byte in text.encode("utf-8")).encode("utf-8")
+
+KOREAN = "한국어 텍스트 파일입니다 ’따옴표’"
+MOJIBAKE = double_encode(KOREAN)
+
+# 1바이트 조각이면 모든 멀티바이트 글자와 깨진 구간이 조각 경계에 걸림
+CHUNK_SIZES = [1, 2, 3, 5, fix_encoding.CHUNK_SIZE]
+
+def scan(data, chunk_size):
+    return fix_encoding.scan(io.BytesIO(data), chunk_size)
+
+def repair(data, status, chunk_size, source_encoding="latin-1"):
+    target = io.BytesIO()
+    runs = fix_encoding.repair(io.BytesIO(data), target, status, source_encoding, chunk_size)
+    return target.getvalue().decode("utf-8"), runs
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_valid_utf8_is_ok(chunk_size):
+    assert scan(f"{KOREAN} café\n".encode("utf-8"), chunk_size) == ("ok", 0)
+    assert scan(b"plain ascii\n", chunk_size) == ("ok", 0)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_binary_file(chunk_size):
+    assert scan(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR", chunk_size) == ("binary", 0)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_cp949_file_is_legacy(chunk_size):
+    data = KOREAN.replace("’", "'").encode("cp949")
+    assert scan(data, chunk_size) == ("legacy", 0)
+    assert repair(data, "legacy", chunk_size, "cp949") == (KOREAN.replace("’", "'"), 0)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_latin1_file_is_legacy(chunk_size):
+    data = "café naïve à la carte".encode("latin-1")
+    assert scan(data, chunk_size) == ("legacy", 0)
+    assert repair(data, "legacy", chunk_size) == ("café naïve à la carte", 0)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_cp1252_mojibake_is_repaired(chunk_size):
+    status, runs = scan(MOJIBAKE, chunk_size)
+    assert status == "mojibake"
+    assert repair(MOJIBAKE, status, chunk_size) == (KOREAN, runs)
+    
+    # 고친 결과는 다시 돌려도 ok (여러 번 돌려도 같은 결과)
+    assert scan(KOREAN.encode("utf-8"), chunk_size) == ("ok", 0)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_mojibake_with_few_latin1_characters(chunk_size):
+    # 원래 Latin-1 글자(é)가 깨진 구간보다 적으면 이중 인코딩으로 보고 깨진 구간만 고침
+    data = MOJIBAKE + " café".encode("utf-8")
+    status, runs = scan(data, chunk_size)
+    assert status == "mojibake"
+    assert repair(data, status, chunk_size) == (KOREAN + " café", runs)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_mojibake_with_more_leftover_characters_is_suspect(chunk_size):
+    data = double_encode("한") + " déjà vu, naïve café, über".encode("utf-8")
+    assert scan(data, chunk_size) == ("suspect", 1)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_utf8_mixed_with_invalid_bytes_is_suspect(chunk_size):
+    data = "café ".encode("latin-1") + KOREAN.encode("utf-8")
+    assert scan(data, chunk_size) == ("suspect", 0)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_chance_multibyte_ratio_threshold(chunk_size):
+    invalid = b"\xe9 " * 4  # UTF-8이 아닌 바이트 4개
+    at_threshold = invalid + "한한".encode("utf-8")  # 올바른 글자 2개 = 4 * CHANCE_MULTIBYTE_RATIO
+    above_threshold = invalid + "한한한".encode("utf-8")
+    assert fix_encoding.CHANCE_MULTIBYTE_RATIO == 0.5
+    assert scan(at_threshold, chunk_size) == ("legacy", 0)
+    assert scan(above_threshold, chunk_size) == ("suspect", 0)
+
+def test_verbose_prints_no_detail_for_unchanged_files(tmp_path):
+    (tmp_path / "ok.txt").write_text("already utf-8 한국어\n", encoding="utf-8")
+    (tmp_path / "image.png").write_bytes(b"\x89PNG\0")
+    (tmp_path / "legacy.txt").write_bytes("café".encode("latin-1"))
+    
+    script = Path(fix_encoding.__file__)
+    result = subprocess.run(
+        [sys.executable, str(script), "tree", str(tmp_path), "--verbose", "--workers", "1"],
+        check=True, capture_output=True, text=True
+    )
+    lines = result.stdout.splitlines()
+    assert f"[ok] {tmp_path / 'ok.txt'}" in lines
+    assert f"[binary] {tmp_path / 'image.png'}" in lines
+    assert f"[legacy] {tmp_path / 'legacy.txt'} latin-1 -> UTF-8" in lines
+    assert (tmp_path / "legacy.txt").read_text(encoding="utf-8") == "café"
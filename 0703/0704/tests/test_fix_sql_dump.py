@@ -0,0 +1,74 @@
+"""fix_sql_dump.py - 덤프 tar의 .sql 멤버 복구 (tar 출력 / 적재 출력)"""
+import io
+import tarfile
+
+import pytest
+
+import fix_sql_dump
+from test_fix_encoding import double_encode
+
+STATEMENT = "INSERT INTO chat VALUES ('한국어 café');\n"
+
+def make_tar(members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as writer:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            writer.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+def load(members, source_encoding="latin-1"):
+    target = io.BytesIO()
+    entries = []
+    fix_sql_dump.load_tar(make_tar(members), target, source_encoding=source_encoding, report=entries.append)
+    return target.getvalue().decode("utf-8"), entries
+
+def test_load_repairs_mojibake_and_transcodes_legacy_members():
+    sql, entries = load({
+        "a.sql": STATEMENT.encode("utf-8"),
+        "b.sql": double_encode(STATEMENT),
+        "c.sql": STATEMENT.replace("한국어 ", "").encode("latin-1"),
+        "image.png": b"\x89PNG\0"
+    })
+    assert sql == "SET NAMES utf8mb4;\n" + f"{STATEMENT}\n{STATEMENT}\n" + STATEMENT.replace("한국어 ", "") + "\n"
+    assert [(entry["path"], entry["status"]) for entry in entries] == [
+        ("a.sql", "ok"), ("b.sql", "mojibake"), ("c.sql", "legacy")
+    ]
+    assert entries[0]["fixed_bytes"] == entries[0]["bytes"]
+
+def test_load_uses_source_encoding_for_legacy_members():
+    sql, entries = load({"dump.sql": STATEMENT.replace("é", "e").encode("cp949")}, source_encoding="cp949")
+    assert sql == "SET NAMES utf8mb4;\n" + STATEMENT.replace("é", "e") + "\n"
+    assert entries[0]["status"] == "legacy"
+
+def test_load_refuses_mixed_member():
+    with pytest.raises(ValueError, match="b.sql"):
+        load({"a.sql": STATEMENT.encode("utf-8"), "b.sql": "café ".encode("latin-1") + STATEMENT.encode("utf-8")})
+
+def test_tar_output_keeps_member_size():
+    target = io.BytesIO()
+    entries = []
+    fix_sql_dump.fix_tar(make_tar({"b.sql": double_encode(STATEMENT)}), target, report=entries.append)
+    target.seek(0)
+    with tarfile.open(fileobj=target) as reader:
+        data = reader.extractfile("b.sql").read()
+    assert len(data) == len(double_encode(STATEMENT))
+    assert data.decode("utf-8").rstrip("\n") + "\n" == STATEMENT
+    assert entries[0]["fixed_bytes"] == len(STATEMENT.encode("utf-8"))
+
+def test_tar_output_refuses_non_utf8_member():
+    with pytest.raises(ValueError, match="c.sql"):
+        fix_sql_dump.fix_tar(make_tar({"c.sql": "café".encode("latin-1")}), io.BytesIO(), report=lambda entry: None)
+
+def test_spooled_tar_output_uses_real_size():
+    target = io.BytesIO()
+    entries = []
+    members = {"b.sql": double_encode(STATEMENT), "c.sql": STATEMENT.replace("한국어 ", "").encode("latin-1")}
+    fix_sql_dump.fix_tar(make_tar(members), target, spool=True, report=entries.append)
+    target.seek(0)
+    with tarfile.open(fileobj=target) as reader:
+        assert reader.extractfile("b.sql").read() == STATEMENT.encode("utf-8")
+        assert reader.extractfile("c.sql").read() == STATEMENT.replace("한국어 ", "").encode("utf-8")
+    assert [entry["status"] for entry in entries] == ["mojibake", "legacy"]
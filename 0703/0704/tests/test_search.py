@@ -0,0 +1,115 @@
+"""전문 검색 (FTS5 trigram) - 순위, 커서 페이지네이션, 짧은 단어, 하이라이트, 색인 트리거"""
+import pytest
+
+import main
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = main.ChatDatabase(str(tmp_path / "sqlite.db"), sharded=False)
+    db.initialize_database()
+    assert db.search_enabled
+    yield db
+    db.close()
+
+def save_messages(db, chatroom_id, messages):
+    return [db.save_message(message, chatroom_id) for message in messages]
+
+def search_all(db, query, limit, chatroom_id=None):
+    """next_cursor를 따라 끝까지 읽은 결과"""
+    results = []
+    cursor = None
+    while True:
+        page, cursor = db.search_messages(query, chatroom_id, limit, cursor)
+        assert len(page) <= limit
+        results += page
+        if cursor is None:
+            return results
+
+def test_more_relevant_message_ranks_first(db):
+    chatroom_id = db.create_chatroom()
+    sparse, dense = save_messages(db, chatroom_id, [
+        "the weather report mentions rain once among many other unrelated words today",
+        "rain rain rain"
+    ])
+    
+    results, next_cursor = db.search_messages("rain", limit=10)
+    assert [result["id"] for result in results] == [dense, sparse]
+    assert results[0]["score"] > results[1]["score"]
+    assert next_cursor is None
+
+def test_cursor_pages_match_single_query(db):
+    chatroom_id = db.create_chatroom()
+    save_messages(db, chatroom_id, [f"{'apple ' * (index % 3 + 1)}note {index}" for index in range(7)])
+    
+    expected, _ = db.search_messages("apple", limit=100)
+    assert len(expected) == 7
+    
+    first_page, cursor = db.search_messages("apple", limit=3)
+    assert cursor is not None
+    second_page, _ = db.search_messages("apple", limit=3, cursor=cursor)
+    assert [result["id"] for result in first_page + second_page] == [result["id"] for result in expected[:6]]
+    
+    assert [result["id"] for result in search_all(db, "apple", 3)] == [result["id"] for result in expected]
+
+def test_short_terms_scan_newest_first(db):
+    chatroom_id = db.create_chatroom()
+    ids = save_messages(db, chatroom_id, ["ok go", "no match", "go ok", "ok then"])
+    
+    results, _ = db.search_messages("ok", limit=10)
+    assert [result["id"] for result in results] == [ids[3], ids[2], ids[0]]
+    assert all(result["score"] is None for result in results)
+    assert results[0]["highlighted"] == "<mark>ok</mark> then"
+    
+    # 짧은 단어는 순위 없는 스캔 모드에서도 rowid 커서로 이어 읽는다
+    assert [result["id"] for result in search_all(db, "ok", 1)] == [ids[3], ids[2], ids[0]]
+    
+    # 긴 단어(MATCH)와 짧은 단어(instr)를 같이 쓰면 둘 다 들어간 메시지만
+    save_messages(db, chatroom_id, ["hello ok", "hello there"])
+    results, _ = db.search_messages("hello ok", limit=10)
+    assert [result["message"] for result in results] == ["hello ok"]
+
+def test_malformed_cursor_is_rejected(db):
+    chatroom_id = db.create_chatroom()
+    save_messages(db, chatroom_id, ["apple pie", "ok"])
+    
+    for query, cursor in [("apple", "garbage"), ("apple", "1.5"), ("apple", "x:1"), ("ok", "x")]:
+        with pytest.raises(ValueError):
+            db.search_messages(query, limit=10, cursor=cursor)
+
+def test_highlight_escapes_user_html(db):
+    chatroom_id = db.create_chatroom()
+    save_messages(db, chatroom_id, ["<script>alert('x')</script> ok"])
+    
+    results, _ = db.search_messages("alert ok", limit=10)
+    highlighted = results[0]["highlighted"]
+    assert "<script>" not in highlighted
+    assert highlighted.startswith("&lt;script&gt;<mark>alert</mark>(&#x27;x&#x27;)&lt;/script&gt;")
+    assert highlighted.endswith(" <mark>ok</mark>")
+    assert results[0]["message"] == "<script>alert('x')</script> ok"
+
+def test_index_follows_inserts_updates_and_deletes(db):
+    chatroom_id = db.create_chatroom()
+    chat_id = db.save_message("original question", chatroom_id)
+    response_id = db.save_response("helpful answer", chat_id, chatroom_id=chatroom_id)
+    
+    results, _ = db.search_messages("answer", limit=10)
+    assert [(result["type"], result["id"]) for result in results] == [("response", response_id)]
+    
+    db.connection.execute("UPDATE chat SET message = 'edited question' WHERE id = ?", (chat_id,))
+    db.connection.commit()
+    assert db.search_messages("original", limit=10)[0] == []
+    assert [result["id"] for result in db.search_messages("edited", limit=10)[0]] == [chat_id]
+    
+    db.connection.execute("DELETE FROM response WHERE id = ?", (response_id,))
+    db.connection.commit()
+    assert db.search_messages("answer", limit=10)[0] == []
+
+def test_search_is_limited_to_chatroom(db):
+    first = db.create_chatroom()
+    second = db.create_chatroom()
+    save_messages(db, first, ["shared topic"])
+    (expected,) = save_messages(db, second, ["shared topic"])
+    
+    results, _ = db.search_messages("topic", chatroom_id=second, limit=10)
+    assert [result["id"] for result in results] == [expected]
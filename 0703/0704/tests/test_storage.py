@@ -0,0 +1,124 @@
+"""ChatStorage 계약 테스트 - SQLiteStorage와 ServerStorage(SQLite 대역)가 같은 결과를 내는지 확인"""
+import asyncio
+import sqlite3
+
+import pytest
+
+import main
+from standin import SQLiteServerStorage
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+@pytest.fixture(params=["sqlite", "server"])
+def storage(request, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # 이미지 폴더(chatroom_N)를 임시 폴더에 만듦
+    if request.param == "sqlite":
+        db = main.ChatDatabase(str(tmp_path / "sqlite.db"), sharded=False)
+        db.initialize_database()
+        storage = main.SQLiteStorage(db)
+    else:
+        storage = SQLiteServerStorage(f"standin://{tmp_path / 'server.db'}")
+        run(storage.open())
+    yield storage
+    run(storage.close())
+
+def test_chatrooms_and_current_chatroom(storage):
+    first = run(storage.create_chatroom())
+    second = run(storage.create_chatroom())
+    run(storage.save_message("hello", second))
+    
+    chatrooms = run(storage.get_chatrooms())
+    assert [room["id"] for room in chatrooms] == [second, first]  # 최근 활동 순, 메시지 없는 방은 뒤
+    assert chatrooms[0]["message_count"] == 1
+    
+    run(storage.set_current_chatroom(second))
+    assert run(storage.get_current_chatroom()) == second
+
+def test_room_version_changes_on_every_write(storage):
+    chatroom_id = run(storage.create_chatroom())
+    versions = [run(storage.get_room_version(chatroom_id))]
+    
+    chat_id = run(storage.save_message("hello", chatroom_id))
+    versions.append(run(storage.get_room_version(chatroom_id)))
+    response_id = run(storage.save_response("hi", chat_id, chatroom_id=chatroom_id))
+    versions.append(run(storage.get_room_version(chatroom_id)))
+    run(storage.update_response_image(response_id, "/tmp/image.jpeg", chatroom_id))
+    versions.append(run(storage.get_room_version(chatroom_id)))
+    
+    assert len(set(versions)) == 4
+    assert run(storage.get_room_version(chatroom_id + 100)) is None
+
+def test_history_and_counts(storage):
+    chatroom_id = run(storage.create_chatroom())
+    for index in range(3):
+        chat_id = run(storage.save_message(f"message {index}", chatroom_id))
+        run(storage.save_response(f"response {index}", chat_id, chatroom_id=chatroom_id))
+    
+    history = run(storage.get_chatroom_history(chatroom_id))
+    assert [(row["user_message"], row["bot_response"]) for row in history] == [
+        (f"message {index}", f"response {index}") for index in range(3)
+    ]
+    assert [row["user_message"] for row in run(storage.get_chatroom_history(chatroom_id, limit=1, offset=1))] == ["message 1"]
+    assert run(storage.get_chatroom_message_count(chatroom_id)) == 3
+    assert run(storage.get_last_activity(chatroom_id)) == history[-1]["chat_time"]
+    assert [row["user_message"] for row in run(storage.get_recent_messages(chatroom_id, 2))] == ["message 1", "message 2"]
+    
+    data = run(storage.get_all_chatroom_data(chatroom_id))
+    assert [item["chat"]["message"] for item in data] == ["message 0", "message 1", "message 2"]
+    assert [[response["message"] for response in item["responses"]] for item in data] == [
+        [f"response {index}"] for index in range(3)
+    ]
+
+def test_timeline_order_and_pages(storage):
+    chatroom_id = run(storage.create_chatroom())
+    for index in range(3):
+        chat_id = run(storage.save_message(f"message {index}", chatroom_id))
+        run(storage.save_response(f"response {index}", chat_id, chatroom_id=chatroom_id))
+    
+    timeline = list(run(storage.get_chatroom_timeline(chatroom_id)))
+    assert [row["seq"] for row in timeline] == [1, 2, 3, 4, 5, 6]
+    assert [row["type"] for row in timeline] == ["chat", "response"] * 3
+    assert timeline[1]["is_response_to_chat"] == timeline[0]["chat_id"]
+    
+    page = list(run(storage.get_chatroom_timeline(chatroom_id, after_seq=2, limit=2)))
+    assert [row["message"] for row in page] == ["message 1", "response 1"]
+
+def test_save_response_with_image(storage, tmp_path):
+    chatroom_id = run(storage.create_chatroom())
+    chat_id = run(storage.save_message("draw", chatroom_id))
+    (tmp_path / "upload.jpeg").write_bytes(b"jpeg")
+    
+    result = run(storage.save_response_with_image("done", chat_id, chatroom_id, "upload.jpeg", "mod"))
+    assert result["success"]
+    assert result["image_path"].endswith("mod_1.jpeg")
+    assert not (tmp_path / "upload.jpeg").exists()
+    
+    data = run(storage.get_all_chatroom_data(chatroom_id))
+    assert data[0]["responses"][0]["image_path"] == result["image_path"]
+    if isinstance(storage, SQLiteServerStorage):
+        assert not (tmp_path / "sqlite.db").exists()  # 서버 DB 모드는 SQLite 파일을 만들지 않음
+
+def test_server_migration_fills_sequence(tmp_path):
+    path = tmp_path / "old.db"
+    connection = sqlite3.connect(path)
+    for query in SQLiteServerStorage.create_table_queries:
+        connection.execute(query)
+    connection.execute("INSERT INTO chatroom DEFAULT VALUES")
+    for index in range(2):
+        chat_id = connection.execute("INSERT INTO chat (message, chatroom_id) VALUES (?, 1)", (f"m{index}",)).lastrowid
+        connection.execute("INSERT INTO response (message, chat_id) VALUES (?, ?)", (f"r{index}", chat_id))
+    connection.commit()
+    connection.close()
+    
+    for _ in range(2):  # 두 번째 open은 schema_version을 보고 건너뜀
+        storage = SQLiteServerStorage(f"standin://{path}")
+        run(storage.open())
+        history = run(storage.get_chatroom_history(1))
+        run(storage.close())
+        assert [(row["user_message"], row["bot_response"]) for row in history] == [("m0", "r0"), ("m1", "r1")]
+    
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT seq FROM chat ORDER BY id").fetchall() == [(1,), (3,)]
+    assert connection.execute("SELECT seq FROM response ORDER BY id").fetchall() == [(2,), (4,)]
+    assert connection.execute("SELECT value FROM app_state WHERE name = 'schema_version'").fetchone() == ("1",)
@@ -0,0 +1,45 @@
+"""아카이브가 섞인 타임라인 페이지네이션"""
+import main
+
+def make_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # 아카이브 폴더를 임시 폴더에 만듦
+    db = main.ChatDatabase(str(tmp_path / "sqlite.db"), sharded=False)
+    db.initialize_database()
+    chatroom_id = db.create_chatroom()
+    for index in range(3):
+        chat_id = db.save_message(f"old {index}", chatroom_id)
+        db.save_response(f"old response {index}", chat_id, chatroom_id=chatroom_id)
+    db.connection.execute("UPDATE chat SET created_at = '2025-01-01 00:00:00'")
+    db.connection.commit()
+    db.archive_old_messages(30)
+    for index in range(2):
+        chat_id = db.save_message(f"new {index}", chatroom_id)
+        db.save_response(f"new response {index}", chat_id, chatroom_id=chatroom_id)
+    return db, chatroom_id
+
+def test_limit_covers_archive_and_live_rows(tmp_path, monkeypatch):
+    db, chatroom_id = make_database(tmp_path, monkeypatch)
+    
+    assert [row["seq"] for row in db.get_chatroom_timeline(chatroom_id, limit=2)] == [1, 2]
+    
+    seqs = []
+    after_seq = None
+    while True:
+        page = list(db.get_chatroom_timeline(chatroom_id, after_seq, limit=4))
+        seqs += [row["seq"] for row in page]
+        if len(page) < 4:
+            break
+        after_seq = page[-1]["seq"]
+    assert seqs == list(range(1, 11))
+    db.close()
+
+def test_archived_rows_without_seq_stay_on_first_page(tmp_path, monkeypatch):
+    db, chatroom_id = make_database(tmp_path, monkeypatch)
+    with db.attach_archive(db.get_archived_months(chatroom_id)[0]) as schema:
+        db.connection.execute(f"UPDATE {schema}.chat SET seq = NULL")
+        db.connection.commit()
+    
+    page = list(db.get_chatroom_timeline(chatroom_id, limit=2))
+    assert [row["seq"] for row in page] == [None, None, None, 2, 4]
+    assert [row["seq"] for row in db.get_chatroom_timeline(chatroom_id, after_seq=4, limit=2)] == [6, 7]
+    db.close()